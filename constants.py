@@ -1,13 +1,30 @@
 """
 Constants module containing bot commands, messages, emojis, API endpoints,
 timeouts, error codes, and payment statuses.
+
+String keys and values of the lookup tables are interned at import so that
+dict lookups and equality checks downstream can short-circuit on identity.
 """
 
+import re
+import sys
+from types import SimpleNamespace
+
+
+def _intern_strings(mapping: dict) -> dict:
+    """Return a copy of ``mapping`` with all string keys and values interned."""
+    return {
+        (sys.intern(key) if isinstance(key, str) else key):
+        (sys.intern(value) if isinstance(value, str) else value)
+        for key, value in mapping.items()
+    }
+
+
 # ============================================================================
 # BOT COMMANDS
 # ============================================================================
 
-BOT_COMMANDS = {
+BOT_COMMANDS = _intern_strings({
     "START": "/start",
     "HELP": "/help",
     "BALANCE": "/balance",
@@ -19,13 +36,16 @@ BOT_COMMANDS = {
     "CANCEL": "/cancel",
     "BACK": "/back",
     "STATUS": "/status",
-}
+})
+
+# Attribute-style access, e.g. BOT.START
+BOT = SimpleNamespace(**BOT_COMMANDS)
 
 # ============================================================================
 # MESSAGES
 # ============================================================================
 
-MESSAGES = {
+MESSAGES = _intern_strings({
     "WELCOME": "Welcome to the Bot! 🎉 Use /help for available commands.",
     "HELP_TEXT": "Available commands:\n/balance - Check your balance\n/deposit - Make a deposit\n/withdraw - Withdraw funds\n/history - View transaction history\n/settings - Manage settings\n/support - Get help",
     "INVALID_COMMAND": "❌ Invalid command. Type /help for available commands.",
@@ -45,13 +65,16 @@ MESSAGES = {
     "AUTHENTICATION_FAILED": "🔒 Authentication failed. Please log in again.",
     "SESSION_EXPIRED": "⏰ Your session has expired. Please log in again.",
     "INVALID_INPUT": "⚠️ Invalid input. Please check and try again.",
-}
+})
+
+# Attribute-style access, e.g. MSG.WELCOME
+MSG = SimpleNamespace(**MESSAGES)
 
 # ============================================================================
 # EMOJIS
 # ============================================================================
 
-EMOJIS = {
+EMOJIS = _intern_strings({
     "SUCCESS": "✅",
     "ERROR": "❌",
     "WARNING": "⚠️",
@@ -76,13 +99,13 @@ EMOJIS = {
     "USERS": "👥",
     "EMPTY": "📭",
     "PARTY": "🎉",
-}
+})
 
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
 
-API_ENDPOINTS = {
+API_ENDPOINTS = _intern_strings({
     "BASE_URL": "https://api.example.com/v1",
     "AUTH_LOGIN": "/auth/login",
     "AUTH_LOGOUT": "/auth/logout",
@@ -100,7 +123,7 @@ API_ENDPOINTS = {
     "SUPPORT_LIST": "/support/list",
     "PAYMENT_STATUS": "/payment/status",
     "PAYMENT_VERIFY": "/payment/verify",
-}
+})
 
 # ============================================================================
 # TIMEOUTS (in seconds)
@@ -124,7 +147,7 @@ TIMEOUTS = {
 # ERROR CODES
 # ============================================================================
 
-ERROR_CODES = {
+ERROR_CODES = _intern_strings({
     "SUCCESS": 200,
     "CREATED": 201,
     "BAD_REQUEST": 400,
@@ -148,13 +171,13 @@ ERROR_CODES = {
     "INVALID_AMOUNT": 1011,
     "TRANSACTION_DECLINED": 1012,
     "UNKNOWN_ERROR": 9999,
-}
+})
 
 # ============================================================================
 # PAYMENT STATUSES
 # ============================================================================
 
-PAYMENT_STATUSES = {
+PAYMENT_STATUSES = _intern_strings({
     "PENDING": "pending",
     "PROCESSING": "processing",
     "COMPLETED": "completed",
@@ -166,13 +189,26 @@ PAYMENT_STATUSES = {
     "ON_HOLD": "on_hold",
     "DISPUTED": "disputed",
     "PARTIALLY_REFUNDED": "partially_refunded",
-}
+})
+
+# Module-level aliases, e.g. PAYMENT_STATUS_COMPLETED
+PAYMENT_STATUS_PENDING = PAYMENT_STATUSES["PENDING"]
+PAYMENT_STATUS_PROCESSING = PAYMENT_STATUSES["PROCESSING"]
+PAYMENT_STATUS_COMPLETED = PAYMENT_STATUSES["COMPLETED"]
+PAYMENT_STATUS_SUCCESSFUL = PAYMENT_STATUSES["SUCCESSFUL"]
+PAYMENT_STATUS_FAILED = PAYMENT_STATUSES["FAILED"]
+PAYMENT_STATUS_CANCELLED = PAYMENT_STATUSES["CANCELLED"]
+PAYMENT_STATUS_REFUNDED = PAYMENT_STATUSES["REFUNDED"]
+PAYMENT_STATUS_EXPIRED = PAYMENT_STATUSES["EXPIRED"]
+PAYMENT_STATUS_ON_HOLD = PAYMENT_STATUSES["ON_HOLD"]
+PAYMENT_STATUS_DISPUTED = PAYMENT_STATUSES["DISPUTED"]
+PAYMENT_STATUS_PARTIALLY_REFUNDED = PAYMENT_STATUSES["PARTIALLY_REFUNDED"]
 
 # ============================================================================
 # PAYMENT METHODS
 # ============================================================================
 
-PAYMENT_METHODS = {
+PAYMENT_METHODS = _intern_strings({
     "CREDIT_CARD": "credit_card",
     "DEBIT_CARD": "debit_card",
     "BANK_TRANSFER": "bank_transfer",
@@ -182,37 +218,37 @@ PAYMENT_METHODS = {
     "STRIPE": "stripe",
     "APPLE_PAY": "apple_pay",
     "GOOGLE_PAY": "google_pay",
-}
+})
 
 # ============================================================================
 # TRANSACTION TYPES
 # ============================================================================
 
-TRANSACTION_TYPES = {
+TRANSACTION_TYPES = _intern_strings({
     "DEPOSIT": "deposit",
     "WITHDRAWAL": "withdrawal",
     "TRANSFER": "transfer",
     "REFUND": "refund",
     "CHARGE": "charge",
     "ADJUSTMENT": "adjustment",
-}
+})
 
 # ============================================================================
 # USER ROLES
 # ============================================================================
 
-USER_ROLES = {
+USER_ROLES = _intern_strings({
     "ADMIN": "admin",
     "MODERATOR": "moderator",
     "USER": "user",
     "GUEST": "guest",
-}
+})
 
 # ============================================================================
 # CURRENCY
 # ============================================================================
 
-CURRENCIES = {
+CURRENCIES = _intern_strings({
     "USD": "USD",
     "EUR": "EUR",
     "GBP": "GBP",
@@ -220,9 +256,9 @@ CURRENCIES = {
     "INR": "INR",
     "AUD": "AUD",
     "CAD": "CAD",
-}
+})
 
-DEFAULT_CURRENCY = "USD"
+DEFAULT_CURRENCY = CURRENCIES["USD"]
 
 # ============================================================================
 # PAGINATION
@@ -246,6 +282,9 @@ REGEX_PATTERNS = {
     "URL": r"^https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)$",
 }
 
+# Compiled once at import so consumers never recompile the patterns
+REGEX_COMPILED = {name: re.compile(pattern) for name, pattern in REGEX_PATTERNS.items()}
+
 # ============================================================================
 # LIMITS
 # ============================================================================
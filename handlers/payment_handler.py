@@ -9,19 +9,47 @@ Comprehensive payment processing logic including:
 """
 
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from secrets import token_hex
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 from decimal import Decimal
-import json
+
+from utils.helpers import to_minor_units
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Russian phone format accepted by SBP, checked after stripping separators
+_SBP_PHONE_RE = re.compile(r'^\+?7\d{10}$')
+_PHONE_SEPARATORS = str.maketrans('', '', ' -')
+_SBP_BANK_CODE_RE = re.compile(r'\d{4,5}')
+_SBP_REQUIRED_FIELDS = frozenset({"phone", "bank_code", "account_number"})
+# Max distinct amounts memoized per offer by Offer.calculate_discount
+_DISCOUNT_MEMO_SIZE = 256
+# Offer fields the derived integer-cents terms are computed from
+_OFFER_TERM_FIELDS = frozenset({
+    "type", "discount_percentage", "cashback_amount", "min_amount", "max_discount",
+})
+
 
-class PaymentStatus(Enum):
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents back to a two-place Decimal"""
+    return Decimal(cents).scaleb(-2)
+
+
+class PaymentStatus(str, Enum):
     """Payment status enumeration"""
     PENDING = "pending"
     PROCESSING = "processing"
@@ -30,16 +58,26 @@ class PaymentStatus(Enum):
     CANCELLED = "cancelled"
     REFUNDED = "refunded"
 
+    # Members are plain strings; render them as their value in logs/f-strings
+    __str__ = str.__str__
+
 
-class PaymentMethod(Enum):
+# Plain status strings for gateway responses, resolved once instead of per call
+_STATUS_PENDING = PaymentStatus.PENDING.value
+_STATUS_COMPLETED = PaymentStatus.COMPLETED.value
+
+
+class PaymentMethod(str, Enum):
     """Available payment methods"""
     SBP = "sbp"  # System for Transfers Between Banks
     CARD = "card"
     WALLET = "wallet"
     BANK_TRANSFER = "bank_transfer"
 
+    __str__ = str.__str__
+
 
-class OfferType(Enum):
+class OfferType(str, Enum):
     """Types of offers available"""
     DISCOUNT = "discount"
     CASHBACK = "cashback"
@@ -47,8 +85,10 @@ class OfferType(Enum):
     FREE_SHIPPING = "free_shipping"
     LOYALTY_POINTS = "loyalty_points"
 
+    __str__ = str.__str__
 
-@dataclass
+
+@dataclass(slots=True)
 class Offer:
     """Data class representing an offer"""
     id: str
@@ -66,12 +106,47 @@ class Offer:
     is_active: bool = True
     usage_limit: Optional[int] = None
     current_usage: int = 0
+    # Derived from the term fields whenever one is set; money values are
+    # held as integer cents, the rate as an exact numerator/denominator
+    _is_discount: bool = field(init=False, repr=False, compare=False)
+    _is_cashback: bool = field(init=False, repr=False, compare=False)
+    _discount_rate: Optional[Tuple[int, int]] = field(init=False, repr=False, compare=False)
+    _min_amount_cents: int = field(init=False, repr=False, compare=False)
+    _max_discount_cents: Optional[int] = field(init=False, repr=False, compare=False)
+    _cashback_cents: Optional[int] = field(init=False, repr=False, compare=False)
+    _discount_memo: Dict[int, int] = field(init=False, repr=False, compare=False)
 
-    def is_valid(self) -> bool:
-        """Check if offer is currently valid"""
-        now = datetime.utcnow()
+    def __post_init__(self):
+        self._derive_terms()
+        self._discount_memo = {}
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # The derived terms exist once __post_init__ has run
+        if name in _OFFER_TERM_FIELDS and hasattr(self, "_discount_memo"):
+            self._derive_terms()
+            # Memoized discounts were computed from the old terms
+            self._discount_memo.clear()
+
+    def _derive_terms(self):
+        """Recompute the integer-cents constants used by calculate_discount"""
+        self._is_discount = self.type == OfferType.DISCOUNT
+        self._is_cashback = self.type == OfferType.CASHBACK
+        if self.discount_percentage:
+            numerator, denominator = Decimal(str(self.discount_percentage)).as_integer_ratio()
+            self._discount_rate = (numerator, denominator * 100)
+        else:
+            self._discount_rate = None
+        self._min_amount_cents = to_minor_units(self.min_amount)
+        self._max_discount_cents = to_minor_units(self.max_discount) if self.max_discount else None
+        self._cashback_cents = to_minor_units(self.cashback_amount) if self.cashback_amount else None
+
+    def is_valid(self, now: Optional[datetime] = None) -> bool:
+        """Check if offer is currently valid (at ``now`` if given)"""
         if not self.is_active:
             return False
+        if now is None:
+            now = datetime.utcnow()
         if self.valid_from and now < self.valid_from:
             return False
         if self.valid_until and now > self.valid_until:
@@ -80,35 +155,78 @@ class Offer:
             return False
         return True
 
-    def calculate_discount(self, amount: Decimal) -> Decimal:
+    def calculate_discount(self, amount: Decimal, now: Optional[datetime] = None) -> Decimal:
         """Calculate discount amount based on offer type"""
-        if not self.is_valid():
-            return Decimal("0.00")
-
-        if amount < self.min_amount:
-            return Decimal("0.00")
-
-        if self.type == OfferType.DISCOUNT and self.discount_percentage:
-            discount = amount * Decimal(str(self.discount_percentage / 100))
-            if self.max_discount:
-                discount = min(discount, self.max_discount)
+        return from_cents(self.calculate_discount_cents(to_minor_units(amount), now))
+
+    def calculate_discount_cents(self, amount_cents: int, now: Optional[datetime] = None) -> int:
+        """Calculate discount in cents for an amount given in cents"""
+        if not self.is_valid(now):
+            return 0
+
+        if amount_cents < self._min_amount_cents:
+            return 0
+
+        discount = self._discount_memo.get(amount_cents)
+        if discount is None:
+            if len(self._discount_memo) >= _DISCOUNT_MEMO_SIZE:
+                self._discount_memo.clear()
+            discount = self._discount_memo[amount_cents] = self._compute_discount_cents(amount_cents)
+        return discount
+
+    def _compute_discount_cents(self, amount_cents: int) -> int:
+        """Discount for an amount, assuming the offer is valid and applicable"""
+        if self._is_discount and self._discount_rate:
+            # Exact rate; the discount rounds half up to the cent, like to_minor_units
+            numerator, denominator = self._discount_rate
+            discount = (2 * amount_cents * numerator + denominator) // (2 * denominator)
+            if self._max_discount_cents:
+                discount = min(discount, self._max_discount_cents)
             return discount
 
-        if self.type == OfferType.CASHBACK and self.cashback_amount:
-            return min(self.cashback_amount, amount)
+        if self._is_cashback and self._cashback_cents:
+            return min(self._cashback_cents, amount_cents)
 
-        return Decimal("0.00")
+        return 0
+
+    def to_dict(self) -> Dict:
+        """Convert offer to dictionary"""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "title": self.title,
+            "description": self.description,
+            "discount_percentage": self.discount_percentage,
+            "cashback_amount": self.cashback_amount,
+            "bonus_points": self.bonus_points,
+            "min_amount": self.min_amount,
+            "max_discount": self.max_discount,
+            "valid_from": self.valid_from,
+            "valid_until": self.valid_until,
+            "code": self.code,
+            "is_active": self.is_active,
+            "usage_limit": self.usage_limit,
+            "current_usage": self.current_usage,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PaymentOffer:
     """Combined payment offer data"""
     offer: Offer
     applied_discount: Decimal
     points_earned: int = 0
 
+    def to_dict(self) -> Dict:
+        """Convert payment offer to dictionary"""
+        return {
+            "offer": self.offer.to_dict(),
+            "applied_discount": self.applied_discount,
+            "points_earned": self.points_earned,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Data class representing a transaction"""
     id: str
@@ -126,6 +244,10 @@ class Transaction:
     final_amount: Decimal = None
     sbp_details: Optional[Dict[str, Any]] = None
     metadata: Dict[str, Any] = None
+    # Last summary built by PaymentProcessor.get_payment_summary and the
+    # (status, updated_at) it was built for
+    _summary_key: Optional[Tuple[PaymentStatus, datetime]] = field(default=None, init=False, repr=False, compare=False)
+    _summary: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.applied_offers is None:
@@ -137,15 +259,23 @@ class Transaction:
 
     def to_dict(self) -> Dict:
         """Convert transaction to dictionary"""
-        data = asdict(self)
-        data['amount'] = str(self.amount)
-        data['total_discount'] = str(self.total_discount)
-        data['final_amount'] = str(self.final_amount)
-        data['payment_method'] = self.payment_method.value
-        data['status'] = self.status.value
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-        return data
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "amount": str(self.amount),
+            "currency": self.currency,
+            "payment_method": self.payment_method.value,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "description": self.description,
+            "order_id": self.order_id,
+            "applied_offers": [po.to_dict() for po in self.applied_offers],
+            "total_discount": str(self.total_discount),
+            "final_amount": str(self.final_amount),
+            "sbp_details": dict(self.sbp_details) if self.sbp_details is not None else None,
+            "metadata": dict(self.metadata),
+        }
 
 
 class OfferManager:
@@ -153,10 +283,13 @@ class OfferManager:
 
     def __init__(self):
         self.offers: Dict[str, Offer] = {}
+        # Guards the usage_limit check-and-increment in apply_offers
+        self._usage_lock = threading.Lock()
         self._initialize_default_offers()
 
     def _initialize_default_offers(self):
         """Initialize default offers"""
+        now = datetime.utcnow()
         default_offers = [
             Offer(
                 id="offer_001",
@@ -166,8 +299,8 @@ class OfferManager:
                 discount_percentage=10,
                 max_discount=Decimal("50.00"),
                 min_amount=Decimal("10.00"),
-                valid_from=datetime.utcnow(),
-                valid_until=datetime.utcnow() + timedelta(days=30),
+                valid_from=now,
+                valid_until=now + timedelta(days=30),
                 code="WELCOME10"
             ),
             Offer(
@@ -177,8 +310,8 @@ class OfferManager:
                 description="Get 5% cashback",
                 cashback_amount=Decimal("5.00"),
                 min_amount=Decimal("50.00"),
-                valid_from=datetime.utcnow(),
-                valid_until=datetime.utcnow() + timedelta(days=90),
+                valid_from=now,
+                valid_until=now + timedelta(days=90),
                 code="CASHBACK5"
             ),
             Offer(
@@ -187,8 +320,8 @@ class OfferManager:
                 title="Free Shipping",
                 description="Free shipping on orders over 500",
                 min_amount=Decimal("500.00"),
-                valid_from=datetime.utcnow(),
-                valid_until=datetime.utcnow() + timedelta(days=60)
+                valid_from=now,
+                valid_until=now + timedelta(days=60)
             )
         ]
 
@@ -198,19 +331,34 @@ class OfferManager:
     def add_offer(self, offer: Offer) -> bool:
         """Add a new offer"""
         if offer.id in self.offers:
-            logger.warning(f"Offer {offer.id} already exists")
+            logger.warning("Offer %s already exists", offer.id)
             return False
         self.offers[offer.id] = offer
-        logger.info(f"Offer {offer.id} added successfully")
+        logger.info("Offer %s added successfully", offer.id)
         return True
 
-    def get_available_offers(self, amount: Decimal) -> List[Offer]:
+    def _claim_usage(self, offer: Offer) -> bool:
+        """Atomically record one use of an offer, honouring its usage_limit"""
+        with self._usage_lock:
+            if offer.usage_limit and offer.current_usage >= offer.usage_limit:
+                return False
+            offer.current_usage += 1
+            return True
+
+    def get_available_offers(self, amount: Decimal, now: Optional[datetime] = None) -> List[Offer]:
         """Get all available offers for a given amount"""
-        available = []
-        for offer in self.offers.values():
-            if offer.is_valid() and amount >= offer.min_amount:
-                available.append(offer)
-        return available
+        return self._get_available_offers_cents(to_minor_units(amount), now)
+
+    def _get_available_offers_cents(self, amount_cents: int, now: Optional[datetime] = None) -> List[Offer]:
+        """Get all available offers for an amount given in cents"""
+        if now is None:
+            now = datetime.utcnow()
+        # Walk the live dict in registration order, which determines how
+        # discounts stack; the integer min_amount check runs before is_valid
+        return [
+            offer for offer in self.offers.values()
+            if amount_cents >= offer._min_amount_cents and offer.is_valid(now)
+        ]
 
     def apply_offers(self, amount: Decimal, offer_ids: List[str] = None) -> Tuple[Decimal, List[PaymentOffer]]:
         """
@@ -224,7 +372,9 @@ class OfferManager:
             Tuple of (total_discount, applied_offers_list)
         """
         applied_offers = []
-        total_discount = Decimal("0.00")
+        amount_cents = to_minor_units(amount)
+        total_discount_cents = 0
+        now = datetime.utcnow()
 
         if offer_ids is None:
             offer_ids = []
@@ -236,23 +386,28 @@ class OfferManager:
                 if offer_id in self.offers:
                     offers_to_apply.append(self.offers[offer_id])
         else:
-            offers_to_apply = self.get_available_offers(amount)
+            offers_to_apply = self._get_available_offers_cents(amount_cents, now)
 
-        # Apply each offer
+        # Apply each offer; calculate_discount_cents already returns 0 for
+        # invalid offers, so validity is checked once per offer
+        claim_usage = self._claim_usage
+        add_applied = applied_offers.append
         for offer in offers_to_apply:
-            if offer.is_valid():
-                discount = offer.calculate_discount(amount - total_discount)
-                if discount > 0:
-                    offer.current_usage += 1
-                    payment_offer = PaymentOffer(
-                        offer=offer,
-                        applied_discount=discount,
-                        points_earned=offer.bonus_points or 0
-                    )
-                    applied_offers.append(payment_offer)
-                    total_discount += discount
-
-        logger.info(f"Applied {len(applied_offers)} offers, total discount: {total_discount}")
+            if total_discount_cents >= amount_cents:
+                # Nothing left to discount; later offers would all yield zero
+                break
+            discount_cents = offer.calculate_discount_cents(amount_cents - total_discount_cents, now)
+            if discount_cents > 0 and claim_usage(offer):
+                add_applied(PaymentOffer(
+                    offer=offer,
+                    applied_discount=from_cents(discount_cents),
+                    points_earned=offer.bonus_points or 0
+                ))
+                total_discount_cents += discount_cents
+
+        total_discount = from_cents(total_discount_cents)
+
+        logger.info("Applied %s offers, total discount: %s", len(applied_offers), total_discount)
         return total_discount, applied_offers
 
     def get_offer_details(self, offer_id: str) -> Optional[Offer]:
@@ -275,18 +430,18 @@ class SBPPaymentProcessor:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        required_fields = ["phone", "bank_code", "account_number"]
-        
-        for field in required_fields:
-            if field not in sbp_details:
-                return False, f"Missing required field: {field}"
-
-        phone = sbp_details.get("phone", "")
-        if not self._validate_phone(phone):
+        missing = _SBP_REQUIRED_FIELDS.difference(sbp_details)
+        if missing:
+            return False, f"Missing required field(s): {', '.join(sorted(missing))}"
+
+        # Exact type checks first: cheap, and non-string values would
+        # otherwise raise inside the validators instead of failing cleanly
+        phone = sbp_details["phone"]
+        if type(phone) is not str or not self._validate_phone(phone):
             return False, "Invalid phone number format"
 
-        bank_code = sbp_details.get("bank_code", "")
-        if not self._validate_bank_code(bank_code):
+        bank_code = sbp_details["bank_code"]
+        if type(bank_code) is not str or not self._validate_bank_code(bank_code):
             return False, "Invalid bank code"
 
         return True, ""
@@ -294,14 +449,12 @@ class SBPPaymentProcessor:
     def _validate_phone(self, phone: str) -> bool:
         """Validate phone number format"""
         # Russian phone format validation (example)
-        import re
-        pattern = r'^\+?7\d{10}$'
-        return bool(re.match(pattern, phone.replace(" ", "").replace("-", "")))
+        return bool(_SBP_PHONE_RE.match(phone.translate(_PHONE_SEPARATORS)))
 
     def _validate_bank_code(self, bank_code: str) -> bool:
         """Validate bank code"""
         # Simple validation - should be 4-5 digit code
-        return bank_code.isdigit() and 4 <= len(bank_code) <= 5
+        return bool(_SBP_BANK_CODE_RE.fullmatch(bank_code))
 
     def initiate_payment(self, transaction: Transaction) -> Tuple[bool, str, Optional[Dict]]:
         """
@@ -312,45 +465,46 @@ class SBPPaymentProcessor:
         """
         is_valid, error_msg = self.validate_sbp_details(transaction.sbp_details)
         if not is_valid:
-            logger.error(f"SBP validation failed: {error_msg}")
+            logger.error("SBP validation failed: %s", error_msg)
             return False, error_msg, None
 
         try:
             payment_ref = self._generate_payment_reference()
+            sbp_details = transaction.sbp_details
             
             # Simulate API call
             payload = {
                 "reference": payment_ref,
                 "amount": str(transaction.final_amount),
                 "currency": transaction.currency,
-                "phone": transaction.sbp_details.get("phone"),
-                "bank_code": transaction.sbp_details.get("bank_code"),
+                "phone": sbp_details.get("phone"),
+                "bank_code": sbp_details.get("bank_code"),
                 "description": transaction.description,
                 "order_id": transaction.order_id
             }
 
-            logger.info(f"Initiating SBP payment: {payment_ref}")
+            logger.info("Initiating SBP payment: %s", payment_ref)
             
             # In production, this would be an actual API call
             response = self._simulate_sbp_api_call(payload)
             
             if response.get("status") == "success":
+                # Reuse the gateway's timestamp rather than reading the clock again
                 return True, "Payment initiated successfully", {
                     "payment_reference": payment_ref,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "status": "pending"
+                    "timestamp": response.get("timestamp") or datetime.utcnow().isoformat(),
+                    "status": _STATUS_PENDING
                 }
             else:
                 return False, response.get("error", "Unknown error"), None
 
         except Exception as e:
-            logger.error(f"Error initiating SBP payment: {str(e)}")
+            logger.error("Error initiating SBP payment: %s", e)
             return False, f"Payment initiation failed: {str(e)}", None
 
     def _generate_payment_reference(self) -> str:
         """Generate unique payment reference"""
-        import uuid
-        return f"SBP_{uuid.uuid4().hex[:12].upper()}"
+        return f"SBP_{token_hex(6).upper()}"
 
     def _simulate_sbp_api_call(self, payload: Dict) -> Dict:
         """Simulate SBP API call (replace with real API in production)"""
@@ -365,26 +519,41 @@ class SBPPaymentProcessor:
         """Verify SBP payment status"""
         try:
             # In production, this would query the SBP system
-            logger.info(f"Verifying payment: {payment_reference}")
+            logger.info("Verifying payment: %s", payment_reference)
             
             return True, {
                 "payment_reference": payment_reference,
-                "status": "completed",
+                "status": _STATUS_COMPLETED,
                 "verified_at": datetime.utcnow().isoformat()
             }
         except Exception as e:
-            logger.error(f"Error verifying payment: {str(e)}")
+            logger.error("Error verifying payment: %s", e)
             return False, None
 
 
 class PaymentProcessor:
     """Main payment processor orchestrating all payment operations"""
 
-    def __init__(self):
+    # Transactions in these states may be evicted once the store is full
+    SETTLED_STATUSES = frozenset({
+        PaymentStatus.COMPLETED,
+        PaymentStatus.FAILED,
+        PaymentStatus.CANCELLED,
+        PaymentStatus.REFUNDED,
+    })
+
+    def __init__(self, max_transactions: int = 10000):
         self.offer_manager = OfferManager()
         self.sbp_processor = SBPPaymentProcessor()
         self.transactions: Dict[str, Transaction] = {}
+        self.max_transactions = max_transactions
+        # IDs of settled transactions, least recently settled first; the
+        # eviction queue, so in-flight transactions are never scanned
+        self._settled: "OrderedDict[str, None]" = OrderedDict()
         self.transaction_counter = 0
+        # UTC date part of transaction IDs, refreshed at the next UTC midnight
+        self._date_prefix = ""
+        self._date_prefix_expires_ts = 0.0
 
     def create_transaction(
         self,
@@ -399,7 +568,11 @@ class PaymentProcessor:
     ) -> Transaction:
         """Create a new transaction"""
         self.transaction_counter += 1
-        transaction_id = f"TXN_{datetime.utcnow().strftime('%Y%m%d')}_{self.transaction_counter:06d}"
+        now_ts = time.time()
+        if now_ts >= self._date_prefix_expires_ts:
+            self._date_prefix = datetime.utcfromtimestamp(now_ts).strftime('%Y%m%d')
+            self._date_prefix_expires_ts = (int(now_ts) // 86400 + 1) * 86400
+        transaction_id = f"TXN_{self._date_prefix}_{self.transaction_counter:06d}"
 
         # Apply offers
         total_discount, applied_offers = self.offer_manager.apply_offers(amount, offer_ids)
@@ -423,7 +596,9 @@ class PaymentProcessor:
         )
 
         self.transactions[transaction_id] = transaction
-        logger.info(f"Created transaction: {transaction_id}")
+        if len(self.transactions) > self.max_transactions:
+            self._evict_settled_transactions()
+        logger.info("Created transaction: %s", transaction_id)
         return transaction
 
     def process_payment(self, transaction_id: str) -> Tuple[bool, str, Optional[Dict]]:
@@ -433,8 +608,8 @@ class PaymentProcessor:
 
         transaction = self.transactions[transaction_id]
 
-        if transaction.status != PaymentStatus.PENDING:
-            return False, f"Transaction is {transaction.status.value}", None
+        if transaction.status is not PaymentStatus.PENDING:
+            return False, f"Transaction is {transaction.status}", None
 
         # Update status
         transaction.status = PaymentStatus.PROCESSING
@@ -447,24 +622,48 @@ class PaymentProcessor:
                 if success:
                     transaction.status = PaymentStatus.COMPLETED
                     transaction.sbp_details.update(sbp_response or {})
-                    logger.info(f"Payment processed successfully: {transaction_id}")
+                    logger.info("Payment processed successfully: %s", transaction_id)
                     return True, "Payment processed successfully", sbp_response
                 else:
                     transaction.status = PaymentStatus.FAILED
-                    logger.error(f"Payment failed: {message}")
+                    logger.error("Payment failed: %s", message)
                     return False, message, None
             else:
                 # Handle other payment methods
                 transaction.status = PaymentStatus.COMPLETED
-                logger.info(f"Payment processed via {transaction.payment_method.value}: {transaction_id}")
+                logger.info("Payment processed via %s: %s", transaction.payment_method, transaction_id)
                 return True, "Payment processed successfully", None
 
         except Exception as e:
             transaction.status = PaymentStatus.FAILED
-            logger.error(f"Error processing payment: {str(e)}")
+            logger.error("Error processing payment: %s", e)
             return False, f"Payment processing error: {str(e)}", None
         finally:
             transaction.updated_at = datetime.utcnow()
+            self._mark_settled(transaction)
+
+    def _mark_settled(self, transaction: Transaction):
+        """Queue a transaction for eviction once it reaches a settled status"""
+        if transaction.status in self.SETTLED_STATUSES:
+            self._settled[transaction.id] = None
+            self._settled.move_to_end(transaction.id)
+
+    def _evict_settled_transactions(self):
+        """Drop least recently settled transactions until within max_transactions"""
+        excess = len(self.transactions) - self.max_transactions
+        settled = self._settled
+        transactions = self.transactions
+        evicted = 0
+        while evicted < excess and settled:
+            txn_id, _ = settled.popitem(last=False)
+            transaction = transactions.get(txn_id)
+            # Skip entries whose status was changed outside this processor
+            if transaction is None or transaction.status not in self.SETTLED_STATUSES:
+                continue
+            del transactions[txn_id]
+            evicted += 1
+        if evicted:
+            logger.info("Evicted %s settled transactions", evicted)
 
     def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
         """Get transaction details"""
@@ -477,29 +676,32 @@ class PaymentProcessor:
 
         transaction = self.transactions[transaction_id]
 
-        if transaction.status != PaymentStatus.COMPLETED:
-            return False, f"Cannot refund transaction in {transaction.status.value} state"
+        if transaction.status is not PaymentStatus.COMPLETED:
+            return False, f"Cannot refund transaction in {transaction.status} state"
 
         try:
             transaction.status = PaymentStatus.REFUNDED
             transaction.updated_at = datetime.utcnow()
             transaction.metadata['refund_reason'] = reason
             transaction.metadata['refunded_at'] = datetime.utcnow().isoformat()
+            self._mark_settled(transaction)
 
-            logger.info(f"Transaction refunded: {transaction_id}")
+            logger.info("Transaction refunded: %s", transaction_id)
             return True, "Refund processed successfully"
 
         except Exception as e:
-            logger.error(f"Error refunding transaction: {str(e)}")
+            logger.error("Error refunding transaction: %s", e)
             return False, f"Refund failed: {str(e)}"
 
     def display_offers(self, amount: Decimal) -> List[Dict]:
         """Display available offers for a given amount"""
-        offers = self.offer_manager.get_available_offers(amount)
+        now = datetime.utcnow()
+        amount_cents = to_minor_units(amount)
+        offers = self.offer_manager._get_available_offers_cents(amount_cents, now)
         
         offer_list = []
         for offer in offers:
-            discount = offer.calculate_discount(amount)
+            discount = from_cents(offer.calculate_discount_cents(amount_cents, now))
             offer_list.append({
                 "id": offer.id,
                 "title": offer.title,
@@ -510,15 +712,34 @@ class PaymentProcessor:
                 "valid_until": offer.valid_until.isoformat() if offer.valid_until else None
             })
 
-        logger.info(f"Displayed {len(offer_list)} offers for amount {amount}")
+        logger.info("Displayed %s offers for amount %s", len(offer_list), amount)
         return offer_list
 
     def get_payment_summary(self, transaction_id: str) -> Optional[Dict]:
-        """Get detailed payment summary"""
+        """
+        Get detailed payment summary
+
+        Built from a summary cached on the transaction until its status
+        or updated_at changes; each call returns a new copy, so callers
+        may modify it.
+        """
+        summary = self._cached_payment_summary(transaction_id)
+        if summary is None:
+            return None
+        copied = dict(summary)
+        copied["applied_offers"] = [dict(offer) for offer in summary["applied_offers"]]
+        return copied
+
+    def _cached_payment_summary(self, transaction_id: str) -> Optional[Dict]:
+        """The cached summary for a transaction, rebuilt when stale; read-only"""
         transaction = self.get_transaction(transaction_id)
         if not transaction:
             return None
 
+        summary_key = (transaction.status, transaction.updated_at)
+        if transaction._summary_key == summary_key:
+            return transaction._summary
+
         summary = {
             "transaction_id": transaction.id,
             "user_id": transaction.user_id,
@@ -542,4 +763,17 @@ class PaymentProcessor:
             "order_id": transaction.order_id
         }
 
+        transaction._summary_key = summary_key
+        transaction._summary = summary
         return summary
+
+    def get_payment_summary_json(self, transaction_id: str) -> Optional[bytes]:
+        """Get payment summary serialized as UTF-8 JSON bytes"""
+        # Serializing only reads the summary, so the cached one needs no copy
+        summary = self._cached_payment_summary(transaction_id)
+        if summary is None:
+            return None
+        if orjson is not None:
+            return orjson.dumps(summary)
+        import json  # only needed without orjson
+        return json.dumps(summary, ensure_ascii=False, separators=(",", ":")).encode()
@@ -5,11 +5,16 @@ This module contains handlers for managing payment flows including offer buttons
 transaction processing, and payment status updates.
 """
 
-from typing import Optional, Dict, Any, Callable
-from dataclasses import dataclass
-from datetime import datetime
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, List, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class PaymentStatus(Enum):
     """Enumeration of possible payment statuses."""
@@ -21,6 +26,13 @@ class PaymentStatus(Enum):
     REFUNDED = "refunded"
 
 
+# Statuses from which PaymentFlowHandler.refund_transaction may refund
+_REFUNDABLE_STATUSES = frozenset({PaymentStatus.COMPLETED, PaymentStatus.PROCESSING})
+
+# Number of locks PaymentFlowHandler stripes transaction updates across
+_LOCK_STRIPES = 16
+
+
 class OfferType(Enum):
     """Enumeration of offer types."""
     DISCOUNT = "discount"
@@ -30,7 +42,7 @@ class OfferType(Enum):
     REFERRAL = "referral"
 
 
-@dataclass
+@dataclass(slots=True)
 class Offer:
     """Data class representing a payment offer."""
     offer_id: str
@@ -40,12 +52,31 @@ class Offer:
     discount_amount: Optional[float] = None
     expiration_date: Optional[datetime] = None
     conditions: Optional[Dict[str, Any]] = None
+    # expiration_date the cached timestamp was computed from, and that timestamp
+    _expiration_source: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    _expiration_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def expiration_ts(self) -> Optional[float]:
+        """POSIX timestamp of expiration_date, recomputed when it is reassigned."""
+        expiration = self.expiration_date
+        if expiration is not self._expiration_source:
+            self._expiration_source = expiration
+            if expiration is None:
+                self._expiration_ts = None
+            else:
+                if expiration.tzinfo is None:
+                    # Naive datetimes in this module are UTC (see utcnow() usage)
+                    expiration = expiration.replace(tzinfo=timezone.utc)
+                self._expiration_ts = expiration.timestamp()
+        return self._expiration_ts
     
     def is_expired(self) -> bool:
         """Check if the offer has expired."""
-        if self.expiration_date is None:
+        expiration_ts = self.expiration_ts
+        if expiration_ts is None:
             return False
-        return datetime.utcnow() > self.expiration_date
+        return time.time() > expiration_ts
     
     def apply_to_amount(self, amount: float) -> float:
         """Calculate the final amount after applying the offer."""
@@ -58,9 +89,34 @@ class Offer:
             return max(0, amount - self.discount_amount)
         
         return amount
+    
+    def apply_to_amounts(self, amounts: List[float]) -> List[float]:
+        """
+        Calculate final amounts for a batch of amounts.
+        
+        Equivalent to calling apply_to_amount on each amount, but expiry
+        and the discount terms are read once for the whole batch.
+        
+        Args:
+            amounts: Amounts to price
+            
+        Returns:
+            Final amounts in the same order
+        """
+        if self.is_expired():
+            return list(amounts)
+        
+        if self.discount_percent:
+            multiplier = 1 - self.discount_percent / 100
+            return [amount * multiplier for amount in amounts]
+        elif self.discount_amount:
+            flat = self.discount_amount
+            return [max(0, amount - flat) for amount in amounts]
+        
+        return list(amounts)
 
 
-@dataclass
+@dataclass(slots=True)
 class PaymentTransaction:
     """Data class representing a payment transaction."""
     transaction_id: str
@@ -71,13 +127,19 @@ class PaymentTransaction:
     created_at: datetime = None
     updated_at: datetime = None
     metadata: Optional[Dict[str, Any]] = None
+    # Last summary built by PaymentFlowHandler.get_payment_summary and the
+    # transaction fields and offer terms it was built from
+    _summary_key: Optional[Tuple[Any, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _summary: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialize datetime fields if not provided."""
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
-        if self.updated_at is None:
-            self.updated_at = datetime.utcnow()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.utcnow()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def get_final_amount(self) -> float:
         """Get the final amount after applying any offers."""
@@ -92,10 +154,11 @@ class OfferButtonHandler:
     def __init__(self):
         """Initialize the offer button handler."""
         self.active_offers: Dict[str, Offer] = {}
-        self.callbacks: Dict[str, list[Callable]] = {
-            'on_offer_clicked': [],
-            'on_offer_applied': [],
-            'on_offer_expired': [],
+        # Immutable tuples: registration rebuilds, dispatch just iterates
+        self.callbacks: Dict[str, Tuple[Callable, ...]] = {
+            'on_offer_clicked': (),
+            'on_offer_applied': (),
+            'on_offer_expired': (),
         }
     
     def register_offer(self, offer: Offer) -> None:
@@ -117,10 +180,7 @@ class OfferButtonHandler:
         Returns:
             True if offer was removed, False if not found
         """
-        if offer_id in self.active_offers:
-            del self.active_offers[offer_id]
-            return True
-        return False
+        return self.active_offers.pop(offer_id, None) is not None
     
     def get_offer(self, offer_id: str) -> Optional[Offer]:
         """
@@ -185,10 +245,14 @@ class OfferButtonHandler:
         Returns:
             List of available offers
         """
-        return [
-            offer for offer in self.active_offers.values()
-            if not offer.is_expired()
-        ]
+        # One clock read for the whole scan, compared as is_expired() does
+        now_ts = time.time()
+        available = []
+        for offer in self.active_offers.values():
+            expiration_ts = offer.expiration_ts
+            if expiration_ts is None or now_ts <= expiration_ts:
+                available.append(offer)
+        return available
     
     def register_callback(self, event: str, callback: Callable) -> None:
         """
@@ -199,7 +263,7 @@ class OfferButtonHandler:
             callback: The callback function
         """
         if event in self.callbacks:
-            self.callbacks[event].append(callback)
+            self.callbacks[event] += (callback,)
     
     def _trigger_callbacks(self, event: str, *args, **kwargs) -> None:
         """
@@ -210,12 +274,11 @@ class OfferButtonHandler:
             *args: Positional arguments to pass to callbacks
             **kwargs: Keyword arguments to pass to callbacks
         """
-        if event in self.callbacks:
-            for callback in self.callbacks[event]:
-                try:
-                    callback(*args, **kwargs)
-                except Exception as e:
-                    print(f"Error in callback for event '{event}': {e}")
+        for callback in self.callbacks.get(event, ()):
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                logger.exception("Error in callback for event '%s'", event)
 
 
 class PaymentFlowHandler:
@@ -225,6 +288,21 @@ class PaymentFlowHandler:
         """Initialize the payment flow handler."""
         self.transactions: Dict[str, PaymentTransaction] = {}
         self.offer_handler = OfferButtonHandler()
+        # Status changes are check-then-set; each transaction ID maps to one
+        # of these locks so unrelated transactions rarely contend
+        self._locks = tuple(threading.Lock() for _ in range(_LOCK_STRIPES))
+    
+    def _lock_for(self, transaction_id: str) -> threading.Lock:
+        """
+        Get the lock guarding status changes of a transaction.
+        
+        Args:
+            transaction_id: The transaction ID
+            
+        Returns:
+            The stripe lock for this transaction ID
+        """
+        return self._locks[hash(transaction_id) % _LOCK_STRIPES]
     
     def create_transaction(
         self,
@@ -281,13 +359,30 @@ class PaymentFlowHandler:
         Returns:
             True if updated successfully, False if transaction not found
         """
-        transaction = self.get_transaction(transaction_id)
-        if not transaction:
-            return False
+        with self._lock_for(transaction_id):
+            transaction = self.transactions.get(transaction_id)
+            if not transaction:
+                return False
+            
+            self._set_status(transaction, status)
+        return True
+    
+    def _set_status(
+        self,
+        transaction: PaymentTransaction,
+        status: PaymentStatus,
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Set the status of an already resolved transaction.
         
+        Args:
+            transaction: The transaction to update
+            status: The new status
+            now: Update timestamp (default: current UTC time)
+        """
         transaction.status = status
-        transaction.updated_at = datetime.utcnow()
-        return True
+        transaction.updated_at = now or datetime.utcnow()
     
     def process_payment(self, transaction_id: str) -> bool:
         """
@@ -299,19 +394,20 @@ class PaymentFlowHandler:
         Returns:
             True if processing started successfully, False otherwise
         """
-        transaction = self.get_transaction(transaction_id)
-        if not transaction:
-            return False
-        
-        if transaction.status != PaymentStatus.PENDING:
-            return False
-        
-        # Update status to processing
-        self.update_transaction_status(transaction_id, PaymentStatus.PROCESSING)
-        
-        # Here you would integrate with payment gateway
-        # For now, we'll simulate successful processing
-        self.update_transaction_status(transaction_id, PaymentStatus.COMPLETED)
+        with self._lock_for(transaction_id):
+            transaction = self.transactions.get(transaction_id)
+            if not transaction or transaction.status is not PaymentStatus.PENDING:
+                return False
+            
+            # One clock read covers both transitions of this call
+            now = datetime.utcnow()
+            
+            # Update status to processing
+            self._set_status(transaction, PaymentStatus.PROCESSING, now)
+            
+            # Here you would integrate with payment gateway
+            # For now, we'll simulate successful processing
+            self._set_status(transaction, PaymentStatus.COMPLETED, now)
         
         return True
     
@@ -325,20 +421,22 @@ class PaymentFlowHandler:
         Returns:
             True if refund was processed, False otherwise
         """
-        transaction = self.get_transaction(transaction_id)
-        if not transaction:
-            return False
-        
-        if transaction.status not in [PaymentStatus.COMPLETED, PaymentStatus.PROCESSING]:
-            return False
-        
-        self.update_transaction_status(transaction_id, PaymentStatus.REFUNDED)
+        with self._lock_for(transaction_id):
+            transaction = self.transactions.get(transaction_id)
+            if not transaction or transaction.status not in _REFUNDABLE_STATUSES:
+                return False
+            
+            self._set_status(transaction, PaymentStatus.REFUNDED)
         return True
     
     def get_payment_summary(self, transaction_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a summary of a payment transaction.
         
+        The summary is cached on the transaction until any field it is
+        built from changes, including the offer's terms and whether it
+        has expired. Each call returns a fresh copy.
+        
         Args:
             transaction_id: The transaction ID
             
@@ -349,10 +447,22 @@ class PaymentFlowHandler:
         if not transaction:
             return None
         
+        offer = transaction.offer
+        offer_key = None
+        if offer is not None:
+            # Offers can be edited in place, so key on their terms, not identity
+            offer_key = (offer.is_expired(), offer.discount_percent, offer.discount_amount)
+        summary_key = (
+            transaction.status, transaction.updated_at, transaction.created_at,
+            transaction.amount, transaction.currency, offer_key
+        )
+        if transaction._summary_key == summary_key:
+            return dict(transaction._summary)
+        
         final_amount = transaction.get_final_amount()
         savings = transaction.amount - final_amount if transaction.offer else 0
         
-        return {
+        summary = {
             'transaction_id': transaction.transaction_id,
             'original_amount': transaction.amount,
             'offer_applied': transaction.offer is not None,
@@ -363,6 +473,10 @@ class PaymentFlowHandler:
             'created_at': transaction.created_at.isoformat(),
             'updated_at': transaction.updated_at.isoformat(),
         }
+        
+        transaction._summary_key = summary_key
+        transaction._summary = summary
+        return dict(summary)
 
 
 # Convenience function to create a default payment flow handler
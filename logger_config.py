@@ -9,6 +9,7 @@ def setup_logging(
     log_file="app.log",
     log_dir="logs",
     console_output=True,
+    force=False,
 ):
     """
     Configure logging with both console and file handlers.
@@ -18,6 +19,7 @@ def setup_logging(
         log_file: Name of the log file (default: "app.log")
         log_dir: Directory for log files (default: "logs")
         console_output: Whether to output to console (default: True)
+        force: Replace handlers on an already configured logger (default: False)
     
     Returns:
         logging.Logger: Configured logger instance
@@ -29,11 +31,27 @@ def setup_logging(
     
     # Create logger
     logger = logging.getLogger(__name__)
+    
+    # Already configured (e.g. by the module-level call below); reuse the
+    # handlers rather than opening the log file again, but honour the level
+    if logger.handlers and not force:
+        logger.setLevel(log_level)
+        for handler in logger.handlers:
+            handler.setLevel(log_level)
+        return logger
+    
     logger.setLevel(log_level)
+    # Records are fully handled here; don't pass them on to root handlers too
+    logger.propagate = False
     
     # Remove existing handlers to avoid duplicates
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        # MemoryHandler.close() flushes but leaves its target open
+        target = getattr(handler, "target", None)
+        handler.close()
+        if target is not None:
+            target.close()
     
     # Define log format
     formatter = logging.Formatter(
@@ -46,11 +64,21 @@ def setup_logging(
     file_handler = logging.handlers.RotatingFileHandler(
         log_file_path,
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5  # Keep 5 backup files
+        backupCount=5,  # Keep 5 backup files
+        delay=True  # Open the file on first write
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    # Buffer file records and write them in batches; errors flush right away.
+    # logging's own atexit shutdown flushes the buffer before closing the file
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    memory_handler.setLevel(log_level)
+    logger.addHandler(memory_handler)
     
     # Console handler
     if console_output:
@@ -83,7 +111,7 @@ logger = setup_logging()
 
 if __name__ == "__main__":
     # Test logging configuration
-    test_logger = setup_logging(log_level=logging.DEBUG)
+    test_logger = setup_logging(log_level=logging.DEBUG, force=True)
     
     test_logger.debug("This is a debug message")
     test_logger.info("This is an info message")
@@ -7,6 +7,8 @@ import os
 import sys
 from typing import Optional
 
+from logger_config import logger
+
 
 class Bot:
     """Base bot class for initialization and management."""
@@ -23,25 +25,25 @@ class Bot:
             raise ValueError("Bot token not provided and BOT_TOKEN environment variable not set")
         
         self.is_running = False
-        print("[BOT] Initialization complete")
+        logger.info("Bot initialization complete")
     
     def start(self) -> None:
         """Start the bot."""
         if self.is_running:
-            print("[BOT] Bot is already running")
+            logger.info("Bot is already running")
             return
         
         self.is_running = True
-        print("[BOT] Bot started successfully")
+        logger.info("Bot started successfully")
     
     def stop(self) -> None:
         """Stop the bot."""
         if not self.is_running:
-            print("[BOT] Bot is not running")
+            logger.info("Bot is not running")
             return
         
         self.is_running = False
-        print("[BOT] Bot stopped")
+        logger.info("Bot stopped")
     
     def status(self) -> str:
         """Get bot status."""
@@ -63,15 +65,15 @@ def main() -> int:
         bot.start()
         
         # Log status
-        print(f"[MAIN] Bot status: {bot.status()}")
+        logger.info("Bot status: %s", bot.status())
         
         # Keep bot running (in production, this would be an event loop)
-        print("[MAIN] Bot is ready")
+        logger.info("Bot is ready")
         
         return 0
     
     except Exception as e:
-        print(f"[ERROR] Failed to initialize bot: {e}", file=sys.stderr)
+        logger.error("Failed to initialize bot: %s", e)
         return 1
 
 
@@ -8,6 +8,8 @@ from typing import Optional, List
 class User:
     """User model representing a user in the system."""
     
+    __slots__ = ('user_id', 'username', 'email', 'created_at', 'is_active')
+    
     def __init__(self, user_id: str, username: str, email: str, created_at: Optional[datetime] = None):
         self.user_id = user_id
         self.username = username
@@ -22,13 +24,14 @@ class User:
 class Order:
     """Order model representing a customer order."""
     
+    __slots__ = ('order_id', 'user_id', 'total_amount', 'status', 'created_at', 'updated_at', 'items')
+    
     def __init__(self, order_id: str, user_id: str, total_amount: float, status: str = "pending"):
         self.order_id = order_id
         self.user_id = user_id
         self.total_amount = total_amount
         self.status = status
-        self.created_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.created_at = self.updated_at = datetime.utcnow()
         self.items = []
     
     def add_item(self, item: dict) -> None:
@@ -48,6 +51,8 @@ class Order:
 class Payment:
     """Payment model representing a payment transaction."""
     
+    __slots__ = ('payment_id', 'order_id', 'amount', 'payment_method', 'status', 'created_at', 'processed_at')
+    
     def __init__(self, payment_id: str, order_id: str, amount: float, payment_method: str, status: str = "pending"):
         self.payment_id = payment_id
         self.order_id = order_id
@@ -73,6 +78,9 @@ class Payment:
 class Transaction:
     """Transaction model representing a financial transaction."""
     
+    __slots__ = ('transaction_id', 'payment_id', 'transaction_type', 'amount', 'reference', 'status',
+                 'created_at', 'completed_at')
+    
     def __init__(self, transaction_id: str, payment_id: str, transaction_type: str, amount: float, 
                  reference: str = ""):
         self.transaction_id = transaction_id
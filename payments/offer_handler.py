@@ -6,15 +6,46 @@ It provides functionality for creating, validating, and managing payment offers
 with various terms, discounts, and conditions.
 """
 
-from dataclasses import dataclass, field
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from decimal import Decimal
 import json
 
+from utils.helpers import to_minor_units
 
-class OfferType(Enum):
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+
+# Naive UTC epoch, for formatting epoch offsets like utcnow().isoformat()
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+# Bounds for percentage validation, built once rather than per check
+_ZERO = Decimal(0)
+_HUNDRED = Decimal(100)
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Return value as a Decimal, reading floats as written (via str)."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize to JSON indented by two spaces, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
+
+
+class OfferType(str, Enum):
     """Types of payment offers."""
     STANDARD = "standard"
     PROMOTIONAL = "promotional"
@@ -22,9 +53,12 @@ class OfferType(Enum):
     BULK_DISCOUNT = "bulk_discount"
     SEASONAL = "seasonal"
     CUSTOM = "custom"
+    
+    # Members are plain strings; serialize and render them as their value
+    __str__ = str.__str__
 
 
-class OfferStatus(Enum):
+class OfferStatus(str, Enum):
     """Status of a payment offer."""
     DRAFT = "draft"
     ACTIVE = "active"
@@ -33,18 +67,22 @@ class OfferStatus(Enum):
     EXPIRED = "expired"
     CANCELLED = "cancelled"
     ACCEPTED = "accepted"
+    
+    __str__ = str.__str__
 
 
-class TermsType(Enum):
+class TermsType(str, Enum):
     """Types of payment terms."""
     IMMEDIATE = "immediate"
     NET_30 = "net_30"
     NET_60 = "net_60"
     NET_90 = "net_90"
     CUSTOM = "custom"
+    
+    __str__ = str.__str__
 
 
-@dataclass
+@dataclass(slots=True)
 class PaymentTerms:
     """Represents payment terms for an offer."""
     
@@ -58,16 +96,18 @@ class PaymentTerms:
     
     def __post_init__(self):
         """Validate terms configuration."""
-        if self.early_payment_discount and not (Decimal(0) <= self.early_payment_discount <= Decimal(100)):
+        early = self.early_payment_discount
+        if early is not None and (early < _ZERO or early > _HUNDRED):
             raise ValueError("Early payment discount must be between 0-100%")
         
-        if self.late_payment_penalty and not (Decimal(0) <= self.late_payment_penalty <= Decimal(100)):
+        late = self.late_payment_penalty
+        if late is not None and (late < _ZERO or late > _HUNDRED):
             raise ValueError("Late payment penalty must be between 0-100%")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert terms to dictionary."""
         return {
-            "terms_type": self.terms_type.value,
+            "terms_type": self.terms_type,
             "days_until_due": self.days_until_due,
             "early_payment_discount": float(self.early_payment_discount) if self.early_payment_discount else None,
             "late_payment_penalty": float(self.late_payment_penalty) if self.late_payment_penalty else None,
@@ -77,7 +117,7 @@ class PaymentTerms:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PaymentOffer:
     """Represents a payment offer with terms and conditions."""
     
@@ -105,10 +145,11 @@ class PaymentOffer:
     
     def __post_init__(self):
         """Validate offer configuration."""
-        if self.discount_percentage and not (Decimal(0) <= self.discount_percentage <= Decimal(100)):
+        percentage = self.discount_percentage
+        if percentage is not None and (percentage < _ZERO or percentage > _HUNDRED):
             raise ValueError("Discount percentage must be between 0-100%")
         
-        if self.discount_amount and self.discount_amount < 0:
+        if self.discount_amount is not None and self.discount_amount < _ZERO:
             raise ValueError("Discount amount cannot be negative")
         
         if self.valid_from and self.valid_until and self.valid_from > self.valid_until:
@@ -120,13 +161,18 @@ class PaymentOffer:
             return False
         return datetime.utcnow() > self.valid_until
     
-    def is_active(self) -> bool:
-        """Check if offer is currently active."""
-        now = datetime.utcnow()
-        
+    def is_active(self, now: Optional[datetime] = None) -> bool:
+        """Check if offer is currently active (at ``now`` if given)."""
         if self.status != OfferStatus.ACTIVE:
             return False
         
+        # No validity window: skip reading the clock
+        if not self.valid_from and not self.valid_until:
+            return True
+        
+        if now is None:
+            now = datetime.utcnow()
+        
         if self.valid_from and now < self.valid_from:
             return False
         
@@ -136,17 +182,22 @@ class PaymentOffer:
         return True
     
     def calculate_total_amount(self) -> Decimal:
-        """Calculate total amount after discounts."""
-        total = self.amount
+        """Calculate total amount after discounts, rounded to the cent."""
+        return Decimal(self.calculate_total_cents()).scaleb(-2)
+    
+    def calculate_total_cents(self) -> int:
+        """Calculate total amount after discounts, in integer cents."""
+        # Exact Decimal arithmetic, rounded to the cent once at the end
+        amount = _as_decimal(self.amount)
+        total = amount
         
         if self.discount_percentage:
-            discount = total * (self.discount_percentage / Decimal(100))
-            total -= discount
+            total -= amount * _as_decimal(self.discount_percentage) / _HUNDRED
         
         if self.discount_amount:
-            total -= self.discount_amount
+            total -= _as_decimal(self.discount_amount)
         
-        return max(total, Decimal(0))
+        return max(to_minor_units(total), 0)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert offer to dictionary."""
@@ -155,8 +206,8 @@ class PaymentOffer:
             "customer_id": self.customer_id,
             "amount": float(self.amount),
             "currency": self.currency,
-            "offer_type": self.offer_type.value,
-            "status": self.status.value,
+            "offer_type": self.offer_type,
+            "status": self.status,
             "description": self.description,
             "terms": self.terms.to_dict() if self.terms else None,
             "discount_percentage": float(self.discount_percentage) if self.discount_percentage else None,
@@ -164,19 +215,36 @@ class PaymentOffer:
             "created_at": self.created_at.isoformat(),
             "valid_from": self.valid_from.isoformat() if self.valid_from else None,
             "valid_until": self.valid_until.isoformat() if self.valid_until else None,
-            "total_amount": float(self.calculate_total_amount()),
+            "total_amount": self.calculate_total_cents() / 100,
             "notes": self.notes,
             "metadata": self.metadata,
         }
 
 
+# Attributes OfferHandler.update_offer may set
+_PAYMENT_OFFER_FIELDS = frozenset(f.name for f in fields(PaymentOffer))
+
+
 class OfferHandler:
     """Handler for managing payment offers and terms."""
     
     def __init__(self):
         """Initialize offer handler."""
         self.offers: Dict[str, PaymentOffer] = {}
-        self.offer_history: List[Dict[str, Any]] = []
+        # Offer event history stored column-wise, one entry per event in
+        # each column; an internal detail, read through get_offer_history
+        self._history_offer_ids: List[str] = []
+        self._history_customer_ids: List[str] = []
+        self._history_event_types: List[str] = []
+        self._history_statuses: List[str] = []
+        # Wall-clock nanoseconds since the epoch, from time.time_ns(); the
+        # clock can step back, so this column is not guaranteed sorted
+        self._history_timestamps_ns = array('q')
+        self._history_amounts = array('d')
+        # offer_id -> positions of that offer's events in the columns above
+        self._history_by_offer: Dict[str, List[int]] = defaultdict(list)
+        # customer_id -> offer IDs in creation order (dict used as ordered set)
+        self._offers_by_customer: Dict[str, Dict[str, None]] = defaultdict(dict)
     
     def create_offer(
         self,
@@ -239,6 +307,7 @@ class OfferHandler:
         )
         
         self.offers[offer_id] = offer
+        self._offers_by_customer[customer_id][offer_id] = None
         self._log_offer_event(offer, "created")
         
         return offer
@@ -262,11 +331,17 @@ class OfferHandler:
             raise ValueError(f"Offer with ID {offer_id} not found")
         
         offer = self.offers[offer_id]
+        previous_customer_id = offer.customer_id
         
+        # Keys that are not offer fields are ignored
         for key, value in kwargs.items():
-            if hasattr(offer, key):
+            if key in _PAYMENT_OFFER_FIELDS:
                 setattr(offer, key, value)
         
+        if offer.customer_id != previous_customer_id:
+            del self._offers_by_customer[previous_customer_id][offer_id]
+            self._offers_by_customer[offer.customer_id][offer_id] = None
+        
         self._log_offer_event(offer, "updated")
         
         return offer
@@ -306,8 +381,9 @@ class OfferHandler:
         
         offer = self.offers[offer_id]
         offer.status = OfferStatus.ACTIVE
+        now = datetime.utcnow()
         if not offer.valid_from:
-            offer.valid_from = datetime.utcnow()
+            offer.valid_from = now
         
         self._log_offer_event(offer, "activated")
         
@@ -356,6 +432,105 @@ class OfferHandler:
         
         return offer
     
+    def calculate_totals(self, offer_ids: Optional[List[str]] = None) -> Dict[str, Decimal]:
+        """
+        Calculate totals after discounts for many offers at once.
+        
+        Args:
+            offer_ids: IDs of the offers to total (default: all offers)
+        
+        Returns:
+            Mapping of offer ID to total amount, rounded to the cent
+        """
+        offers = self.offers
+        if offer_ids is None:
+            offer_ids = offers
+        
+        return {
+            offer_id: Decimal(offers[offer_id].calculate_total_cents()).scaleb(-2)
+            for offer_id in offer_ids
+        }
+    
+    def approve_offers(self, offer_ids: Iterable[str]) -> List[PaymentOffer]:
+        """
+        Approve several offers at once.
+        
+        Args:
+            offer_ids: IDs of the offers to approve
+        
+        Returns:
+            List of approved offers
+        """
+        offers = self._resolve_offers(offer_ids)
+        for offer in offers:
+            offer.status = OfferStatus.APPROVED
+        
+        self._log_offer_events(offers, "approved")
+        
+        return offers
+    
+    def activate_offers(self, offer_ids: Iterable[str]) -> List[PaymentOffer]:
+        """
+        Activate several offers at once.
+        
+        Args:
+            offer_ids: IDs of the offers to activate
+        
+        Returns:
+            List of activated offers
+        """
+        offers = self._resolve_offers(offer_ids)
+        now = datetime.utcnow()
+        for offer in offers:
+            offer.status = OfferStatus.ACTIVE
+            if not offer.valid_from:
+                offer.valid_from = now
+        
+        self._log_offer_events(offers, "activated")
+        
+        return offers
+    
+    def cancel_offers(self, offer_ids: Iterable[str], reason: Optional[str] = None) -> List[PaymentOffer]:
+        """
+        Cancel several offers at once.
+        
+        Args:
+            offer_ids: IDs of the offers to cancel
+            reason: Reason for cancellation
+        
+        Returns:
+            List of cancelled offers
+        """
+        offers = self._resolve_offers(offer_ids)
+        notes = f"Cancelled: {reason}" if reason else None
+        for offer in offers:
+            offer.status = OfferStatus.CANCELLED
+            if notes:
+                offer.notes = notes
+        
+        self._log_offer_events(offers, "cancelled")
+        
+        return offers
+    
+    def _resolve_offers(self, offer_ids: Iterable[str]) -> List[PaymentOffer]:
+        """
+        Look up offers by ID, failing before any of them is modified.
+        
+        Args:
+            offer_ids: IDs of the offers
+        
+        Returns:
+            List of offers in the given order
+        """
+        get_offer = self.offers.get
+        offers = []
+        for offer_id in offer_ids:
+            offer = get_offer(offer_id)
+            if offer is None:
+                raise ValueError(f"Offer with ID {offer_id} not found")
+            offers.append(offer)
+        return offers
+    
     def get_offer(self, offer_id: str) -> Optional[PaymentOffer]:
         """
         Get an offer by ID.
@@ -385,32 +560,84 @@ class OfferHandler:
         Returns:
             List of offers
         """
-        offers = [
-            offer for offer in self.offers.values()
-            if offer.customer_id == customer_id
+        offers = self.offers
+        offer_ids = self._offers_by_customer.get(customer_id, ())
+        # One clock read shared by every is_active() check
+        now = datetime.utcnow() if active_only else None
+        
+        return [
+            offer for offer in map(offers.__getitem__, offer_ids)
+            if (not status or offer.status == status)
+            and (not active_only or offer.is_active(now))
         ]
+    
+    def get_offer_history(
+        self,
+        offer_id: Optional[str] = None,
+        since_seq: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get offer history, oldest first.
         
-        if status:
-            offers = [o for o in offers if o.status == status]
+        Each event is a new dict with the original offer_id, customer_id,
+        event_type, status, timestamp and amount keys, plus "seq" (the
+        event's position, usable as a cursor) and "timestamp_ns". The
+        list is built on each call; log events through the handler's
+        methods rather than editing it.
         
-        if active_only:
-            offers = [o for o in offers if o.is_active()]
+        Args:
+            offer_id: Filter by offer ID (optional)
+            since_seq: Only events whose "seq" is at least this value;
+                pass the last seen seq + 1 to resume (optional)
         
-        return offers
+        Returns:
+            List of history events
+        """
+        # seq is the event's position in the columns, so it is the start index
+        start = 0 if since_seq is None else max(since_seq, 0)
+        
+        if offer_id:
+            positions = self._history_by_offer.get(offer_id, ())
+            # Positions are ascending; skip those before start
+            return self._history_records(positions[bisect_left(positions, start):])
+        return self._history_records(range(start, len(self._history_offer_ids)))
     
-    def get_offer_history(self, offer_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def _history_records(self, indices) -> List[Dict[str, Any]]:
         """
-        Get offer history.
+        Build history event dicts for the given positions.
         
         Args:
-            offer_id: Filter by offer ID (optional)
+            indices: Positions in the history columns
         
         Returns:
             List of history events
         """
-        if offer_id:
-            return [e for e in self.offer_history if e.get("offer_id") == offer_id]
-        return self.offer_history
+        offer_ids = self._history_offer_ids
+        customer_ids = self._history_customer_ids
+        event_types = self._history_event_types
+        statuses = self._history_statuses
+        timestamps_ns = self._history_timestamps_ns
+        amounts = self._history_amounts
+        
+        records = []
+        # Consecutive events often share a timestamp; format it once
+        last_ns, last_timestamp = None, None
+        for i in indices:
+            timestamp_ns = timestamps_ns[i]
+            if timestamp_ns != last_ns:
+                last_ns = timestamp_ns
+                last_timestamp = (_EPOCH + timestamp_ns // 1000 * _ONE_MICROSECOND).isoformat()
+            records.append({
+                "seq": i,
+                "offer_id": offer_ids[i],
+                "customer_id": customer_ids[i],
+                "event_type": event_types[i],
+                "status": statuses[i],
+                "timestamp": last_timestamp,
+                "timestamp_ns": timestamp_ns,
+                "amount": amounts[i],
+            })
+        return records
     
     def _log_offer_event(self, offer: PaymentOffer, event_type: str) -> None:
         """
@@ -420,14 +647,36 @@ class OfferHandler:
             offer: The offer
             event_type: Type of event
         """
-        self.offer_history.append({
-            "offer_id": offer.offer_id,
-            "customer_id": offer.customer_id,
-            "event_type": event_type,
-            "status": offer.status.value,
-            "timestamp": datetime.utcnow().isoformat(),
-            "amount": float(offer.amount),
-        })
+        timestamp_ns = time.time_ns()
+        self._history_by_offer[offer.offer_id].append(len(self._history_offer_ids))
+        self._history_offer_ids.append(offer.offer_id)
+        self._history_customer_ids.append(offer.customer_id)
+        self._history_event_types.append(event_type)
+        self._history_statuses.append(offer.status.value)
+        self._history_timestamps_ns.append(timestamp_ns)
+        self._history_amounts.append(float(offer.amount))
+    
+    def _log_offer_events(self, offers: List[PaymentOffer], event_type: str) -> None:
+        """
+        Log the same event for several offers, sharing one timestamp.
+        
+        Args:
+            offers: The offers
+            event_type: Type of event
+        """
+        timestamp_ns = time.time_ns()
+        by_offer = self._history_by_offer
+        start = len(self._history_offer_ids)
+        for position, offer in enumerate(offers, start):
+            by_offer[offer.offer_id].append(position)
+        
+        count = len(offers)
+        self._history_offer_ids.extend([offer.offer_id for offer in offers])
+        self._history_customer_ids.extend([offer.customer_id for offer in offers])
+        self._history_event_types.extend([event_type] * count)
+        self._history_statuses.extend([offer.status.value for offer in offers])
+        self._history_timestamps_ns.extend([timestamp_ns] * count)
+        self._history_amounts.extend([float(offer.amount) for offer in offers])
     
     def export_offer(self, offer_id: str) -> str:
         """
@@ -443,7 +692,27 @@ class OfferHandler:
         if not offer:
             raise ValueError(f"Offer with ID {offer_id} not found")
         
-        return json.dumps(offer.to_dict(), indent=2)
+        return _dumps_indented(offer.to_dict())
+    
+    def export_offers(self, offer_ids: List[str]) -> str:
+        """
+        Export several offers as one JSON array string.
+        
+        Args:
+            offer_ids: IDs of the offers, in output order
+        
+        Returns:
+            JSON string representation of the offers
+        """
+        get_offer = self.offers.get
+        records = []
+        for offer_id in offer_ids:
+            offer = get_offer(offer_id)
+            if offer is None:
+                raise ValueError(f"Offer with ID {offer_id} not found")
+            records.append(offer.to_dict())
+        
+        return _dumps_indented(records)
 
 
 # Default payment terms presets
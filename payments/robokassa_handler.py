@@ -7,17 +7,32 @@ It handles payment initialization, verification, and webhook processing.
 
 import hashlib
 import hmac
+import json
 import logging
 from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, Optional, Any
 from datetime import datetime
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_md5 = hashlib.md5
+
+# Query parameters RobokassaHandler.create_payment_url always sets itself
+_CORE_URL_PARAMS = frozenset({"MerchantLogin", "Sum", "InvId", "Description", "IsTest"})
+
+# Fields every webhook must carry; the tuple keeps error messages in a stable order
+_REQUIRED_WEBHOOK_FIELDS = ("InvId", "Sum", "SignatureValue", "MerchantLogin")
+_REQUIRED_WEBHOOK_FIELD_SET = frozenset(_REQUIRED_WEBHOOK_FIELDS)
+
 
 class PaymentStatus(Enum):
     """Robokassa payment status codes."""
@@ -28,6 +43,35 @@ class PaymentStatus(Enum):
     EXPIRED = "expired"
 
 
+# Hex length of an MD5 digest, the only valid signature length
+_SIGNATURE_HEX_LENGTH = 32
+
+_STATUS_SUCCESS = PaymentStatus.SUCCESS.value
+_STATUS_FAILED = PaymentStatus.FAILED.value
+
+
+def _failed_webhook_response(
+    message: str, order_id: Optional[str] = None, amount: Optional[float] = None
+) -> Dict[str, Any]:
+    """Build a failed process_webhook result, with order fields once the payload is parsed."""
+    if order_id is None:
+        return {"success": False, "status": _STATUS_FAILED, "message": message}
+    return {
+        "success": False,
+        "order_id": order_id,
+        "status": _STATUS_FAILED,
+        "amount": amount,
+        "message": message,
+    }
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
 @dataclass
 class RobokassaConfig:
     """Configuration for Robokassa payment gateway."""
@@ -60,7 +104,51 @@ class RobokassaHandler:
             config: RobokassaConfig instance with merchant credentials
         """
         self.config = config
-        self.session = requests.Session()
+        # Created on first use; nothing in the webhook/URL paths needs HTTP
+        self._session: Optional[requests.Session] = None
+        # Per-merchant parts of the payment URL, quoted once
+        self._url_prefix = (
+            f"{config.base_url}/Basket.aspx?MerchantLogin={quote_plus(config.merchant_id)}&Sum="
+        )
+        self._url_is_test = "&IsTest=1" if config.test_mode else "&IsTest=0"
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for Robokassa API calls, pooled across requests."""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+    
+    def _signature_base(self,
+                        merchant_id: str,
+                        amount: float,
+                        order_id: str,
+                        extra_params: Optional[Dict[str, str]] = None):
+        """
+        Hash the password-independent part of a Robokassa signature.
+        
+        Args:
+            merchant_id: Merchant ID
+            amount: Payment amount in rubles
+            order_id: Unique order identifier
+            extra_params: Additional parameters to include in signature
+            
+        Returns:
+            MD5 hash object fed with everything up to the password
+        """
+        if not extra_params:
+            # Usual case: a single formatted string, trailing ':' before the password
+            return _md5(f"{merchant_id}:{amount}:{order_id}:".encode())
+        
+        signature_parts = [merchant_id, str(amount), order_id]
+        
+        # Add extra parameters in sorted order
+        signature_parts.extend([f"{key}={value}" for key, value in sorted(extra_params.items())])
+        
+        # Trailing empty part leaves the separator before the password
+        signature_parts.append("")
+        
+        return _md5(":".join(signature_parts).encode())
     
     def _generate_signature(self, 
                            merchant_id: str,
@@ -81,19 +169,11 @@ class RobokassaHandler:
         Returns:
             MD5 hash signature
         """
-        signature_parts = [merchant_id, str(amount), order_id]
-        
-        if extra_params:
-            # Add extra parameters in sorted order
-            for key in sorted(extra_params.keys()):
-                signature_parts.append(f"{key}={extra_params[key]}")
-        
-        signature_parts.append(password)
+        signature_hash = self._signature_base(merchant_id, amount, order_id, extra_params)
+        signature_hash.update(password.encode())
+        signature = signature_hash.hexdigest()
         
-        signature_str = ":".join(signature_parts)
-        signature = hashlib.md5(signature_str.encode()).hexdigest()
-        
-        logger.debug(f"Generated signature for order {order_id}: {signature}")
+        logger.debug("Generated signature for order %s: %s", order_id, signature)
         return signature
     
     def _verify_signature(self,
@@ -115,25 +195,35 @@ class RobokassaHandler:
         Returns:
             True if signature is valid, False otherwise
         """
+        # Anything that is not 32 ASCII characters can never match, so skip hashing;
+        # Robokassa may send the hex digest uppercase
+        if (type(provided_signature) is not str
+                or len(provided_signature) != _SIGNATURE_HEX_LENGTH
+                or not provided_signature.isascii()):
+            logger.warning("Signature verification failed for order %s", order_id)
+            return False
+        provided_signature = provided_signature.lower()
+        
+        # Both candidate signatures share everything but the password;
+        # hash that once and finish a copy per password
+        base_hash = self._signature_base(merchant_id, amount, order_id, extra_params)
+        
         # Try with password2 first (used for payment confirmation)
-        expected_signature = self._generate_signature(
-            merchant_id, amount, order_id, self.config.password2, extra_params
-        )
+        signature_hash = base_hash.copy()
+        signature_hash.update(self.config.password2.encode())
         
-        if hmac.compare_digest(provided_signature, expected_signature):
-            logger.info(f"Signature verified successfully for order {order_id}")
+        if hmac.compare_digest(provided_signature, signature_hash.hexdigest()):
+            logger.info("Signature verified successfully for order %s", order_id)
             return True
         
         # Fall back to password1 for backwards compatibility
-        expected_signature = self._generate_signature(
-            merchant_id, amount, order_id, self.config.password1, extra_params
-        )
+        base_hash.update(self.config.password1.encode())
         
-        if hmac.compare_digest(provided_signature, expected_signature):
-            logger.info(f"Signature verified with password1 for order {order_id}")
+        if hmac.compare_digest(provided_signature, base_hash.hexdigest()):
+            logger.info("Signature verified with password1 for order %s", order_id)
             return True
         
-        logger.warning(f"Signature verification failed for order {order_id}")
+        logger.warning("Signature verification failed for order %s", order_id)
         return False
     
     def create_payment_url(self,
@@ -157,24 +247,6 @@ class RobokassaHandler:
         Returns:
             Complete payment URL for user redirect
         """
-        params = {
-            "MerchantLogin": self.config.merchant_id,
-            "Sum": str(round(amount, 2)),
-            "InvId": str(order_id),
-            "Description": description,
-            "IsTest": "1" if self.config.test_mode else "0",
-        }
-        
-        # Add optional parameters
-        if email:
-            params["Email"] = email
-        if phone:
-            params["Phone"] = phone
-        
-        # Add extra parameters
-        extra_params = extra_params or {}
-        params.update(extra_params)
-        
         # Generate signature
         signature = self._generate_signature(
             self.config.merchant_id,
@@ -183,13 +255,42 @@ class RobokassaHandler:
             self.config.password1,
             extra_params if extra_params else None
         )
-        params["SignatureValue"] = signature
         
-        # Build URL
+        # Optional parameters follow the fixed ones
+        params = {}
+        if email:
+            params["Email"] = email
+        if phone:
+            params["Phone"] = phone
+        
         payment_url = f"{self.config.base_url}/Basket.aspx"
-        full_url = f"{payment_url}?{urlencode(params)}"
         
-        logger.info(f"Created payment URL for order {order_id}: {payment_url}")
+        if extra_params and not _CORE_URL_PARAMS.isdisjoint(extra_params):
+            # Extras override fixed parameters; encode everything generically
+            params = {
+                "MerchantLogin": self.config.merchant_id,
+                "Sum": str(round(amount, 2)),
+                "InvId": str(order_id),
+                "Description": description,
+                "IsTest": "1" if self.config.test_mode else "0",
+                **params,
+                **extra_params,
+                "SignatureValue": signature,
+            }
+            full_url = f"{payment_url}?{urlencode(params)}"
+        else:
+            if extra_params:
+                params.update(extra_params)
+            params["SignatureValue"] = signature
+            
+            # Build URL from the precomputed merchant prefix
+            full_url = (
+                f"{self._url_prefix}{quote_plus(str(round(amount, 2)))}"
+                f"&InvId={quote_plus(str(order_id))}&Description={quote_plus(description)}"
+                f"{self._url_is_test}&{urlencode(params)}"
+            )
+        
+        logger.info("Created payment URL for order %s: %s", order_id, payment_url)
         return full_url
     
     def process_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -214,7 +315,7 @@ class RobokassaHandler:
             signature = webhook_data.get("SignatureValue", "")
             operation_id = webhook_data.get("OperationId", "")
             
-            logger.info(f"Processing webhook for order {order_id}, amount: {amount}")
+            logger.info("Processing webhook for order %s, amount: %s", order_id, amount)
             
             # Verify signature
             if not self._verify_signature(
@@ -223,38 +324,29 @@ class RobokassaHandler:
                 order_id,
                 signature
             ):
-                return {
-                    "success": False,
-                    "order_id": order_id,
-                    "status": PaymentStatus.FAILED.value,
-                    "amount": amount,
-                    "message": "Signature verification failed"
-                }
+                return _failed_webhook_response(
+                    "Signature verification failed", order_id=order_id, amount=amount
+                )
             
             # Verify merchant ID
             if webhook_data.get("MerchantLogin") != self.config.merchant_id:
-                logger.warning(f"Merchant ID mismatch in webhook for order {order_id}")
-                return {
-                    "success": False,
-                    "order_id": order_id,
-                    "status": PaymentStatus.FAILED.value,
-                    "amount": amount,
-                    "message": "Merchant ID mismatch"
-                }
+                logger.warning("Merchant ID mismatch in webhook for order %s", order_id)
+                return _failed_webhook_response(
+                    "Merchant ID mismatch", order_id=order_id, amount=amount
+                )
             
-            # Determine payment status
-            status = PaymentStatus.SUCCESS
             is_test = webhook_data.get("IsTest") == "1"
             
             logger.info(
-                f"Payment webhook processed successfully for order {order_id}, "
-                f"operation_id: {operation_id}, test: {is_test}"
+                "Payment webhook processed successfully for order %s, "
+                "operation_id: %s, test: %s",
+                order_id, operation_id, is_test
             )
             
             return {
                 "success": True,
                 "order_id": order_id,
-                "status": status.value,
+                "status": _STATUS_SUCCESS,
                 "amount": amount,
                 "operation_id": operation_id,
                 "is_test": is_test,
@@ -262,12 +354,20 @@ class RobokassaHandler:
             }
             
         except (ValueError, KeyError) as e:
-            logger.error(f"Error processing webhook: {str(e)}")
-            return {
-                "success": False,
-                "status": PaymentStatus.FAILED.value,
-                "message": f"Error processing webhook: {str(e)}"
-            }
+            logger.error("Error processing webhook: %s", e)
+            return _failed_webhook_response(f"Error processing webhook: {str(e)}")
+    
+    def process_webhook_json(self, webhook_data: Dict[str, Any]) -> bytes:
+        """
+        Process a webhook and return the result serialized as JSON.
+        
+        Args:
+            webhook_data: Dictionary containing webhook data from Robokassa
+            
+        Returns:
+            UTF-8 encoded JSON of the process_webhook result
+        """
+        return _dumps_compact(self.process_webhook(webhook_data))
     
     def get_payment_status(self, order_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -285,11 +385,11 @@ class RobokassaHandler:
         try:
             # This would require additional API credentials
             # Implementation depends on Robokassa API version being used
-            logger.info(f"Retrieving payment status for order {order_id}")
+            logger.info("Retrieving payment status for order %s", order_id)
             return None
             
         except Exception as e:
-            logger.error(f"Error getting payment status: {str(e)}")
+            logger.error("Error getting payment status: %s", e)
             return None
     
     def build_sbp_payment_url(self,
@@ -335,11 +435,10 @@ class RobokassaHandler:
         Returns:
             Tuple of (is_valid, message)
         """
-        required_fields = ["InvId", "Sum", "SignatureValue", "MerchantLogin"]
-        
-        for field in required_fields:
-            if field not in webhook_data:
-                return False, f"Missing required field: {field}"
+        if not _REQUIRED_WEBHOOK_FIELD_SET.issubset(webhook_data):
+            for field in _REQUIRED_WEBHOOK_FIELDS:
+                if field not in webhook_data:
+                    return False, f"Missing required field: {field}"
         
         try:
             float(webhook_data["Sum"])
@@ -351,7 +450,9 @@ class RobokassaHandler:
     
     def close(self):
         """Close the session."""
-        self.session.close()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
     
     def __enter__(self):
         """Context manager entry."""
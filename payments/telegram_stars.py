@@ -5,9 +5,12 @@ This module provides functionality for handling Telegram Stars payments,
 including star transfers and premium subscription management.
 """
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
+from bisect import insort
+from collections import defaultdict
 from decimal import Decimal
 from enum import Enum
+from types import MappingProxyType
 import logging
 
 logger = logging.getLogger(__name__)
@@ -65,14 +68,19 @@ class StarsPricing:
         return cls.PREMIUM_PRICES.get(duration)
     
     @classmethod
-    def get_all_packages(cls) -> Dict[int, Decimal]:
-        """Get all available star packages."""
-        return cls.PRICES.copy()
+    def get_all_packages(cls) -> Mapping[int, Decimal]:
+        """Get all available star packages (read-only view; use dict() to modify)."""
+        return _PRICES_VIEW
     
     @classmethod
-    def get_all_subscriptions(cls) -> Dict[str, int]:
-        """Get all available premium subscriptions."""
-        return cls.PREMIUM_PRICES.copy()
+    def get_all_subscriptions(cls) -> Mapping[str, int]:
+        """Get all available premium subscriptions (read-only view; use dict() to modify)."""
+        return _PREMIUM_PRICES_VIEW
+
+
+# Read-only views handed out by the getters instead of a fresh copy per call
+_PRICES_VIEW = MappingProxyType(StarsPricing.PRICES)
+_PREMIUM_PRICES_VIEW = MappingProxyType(StarsPricing.PREMIUM_PRICES)
 
 
 class TelegramStarsAPI:
@@ -113,25 +121,26 @@ class TelegramStarsAPI:
         """
         try:
             if amount <= 0:
-                self.logger.error(f"Invalid transfer amount: {amount}")
+                self.logger.error("Invalid transfer amount: %s", amount)
                 return False, None
             
             if amount > 1000000:  # Sanity check
-                self.logger.error(f"Transfer amount exceeds maximum: {amount}")
+                self.logger.error("Transfer amount exceeds maximum: %s", amount)
                 return False, None
             
             # Implementation would call actual Telegram API
             # This is a placeholder for the API integration
             transaction_id = f"txn_{user_id}_{amount}"
             self.logger.info(
-                f"Stars transferred: {amount} to user {user_id}, "
-                f"reason: {reason}, transaction: {transaction_id}"
+                "Stars transferred: %s to user %s, "
+                "reason: %s, transaction: %s",
+                amount, user_id, reason, transaction_id
             )
             
             return True, transaction_id
             
         except Exception as e:
-            self.logger.exception(f"Error transferring stars: {e}")
+            self.logger.exception("Error transferring stars: %s", e)
             return False, None
     
     async def give_premium_subscription(
@@ -154,7 +163,7 @@ class TelegramStarsAPI:
         try:
             cost = StarsPricing.get_premium_cost(duration)
             if cost is None:
-                self.logger.error(f"Unknown subscription duration: {duration}")
+                self.logger.error("Unknown subscription duration: %s", duration)
                 return False, None
             
             if stars_deducted is None:
@@ -162,22 +171,24 @@ class TelegramStarsAPI:
             
             if stars_deducted < cost:
                 self.logger.error(
-                    f"Insufficient stars for {duration} subscription. "
-                    f"Need: {cost}, Got: {stars_deducted}"
+                    "Insufficient stars for %s subscription. "
+                    "Need: %s, Got: %s",
+                    duration, cost, stars_deducted
                 )
                 return False, None
             
             # Implementation would activate subscription in database
             subscription_id = f"sub_{user_id}_{duration}"
             self.logger.info(
-                f"Premium subscription granted: {duration} to user {user_id}, "
-                f"cost: {stars_deducted} stars, subscription: {subscription_id}"
+                "Premium subscription granted: %s to user %s, "
+                "cost: %s stars, subscription: %s",
+                duration, user_id, stars_deducted, subscription_id
             )
             
             return True, subscription_id
             
         except Exception as e:
-            self.logger.exception(f"Error granting premium subscription: {e}")
+            self.logger.exception("Error granting premium subscription: %s", e)
             return False, None
     
     async def check_user_stars(self, user_id: int) -> Optional[int]:
@@ -192,11 +203,11 @@ class TelegramStarsAPI:
         """
         try:
             # Implementation would query user's star balance from Telegram API
-            self.logger.info(f"Star balance check for user {user_id}")
+            self.logger.info("Star balance check for user %s", user_id)
             return None  # Placeholder
             
         except Exception as e:
-            self.logger.exception(f"Error checking star balance: {e}")
+            self.logger.exception("Error checking star balance: %s", e)
             return None
     
     async def process_star_payment(
@@ -220,20 +231,21 @@ class TelegramStarsAPI:
         """
         try:
             if amount_stars <= 0:
-                self.logger.error(f"Invalid payment amount: {amount_stars}")
+                self.logger.error("Invalid payment amount: %s", amount_stars)
                 return False, None
             
             # Implementation would verify user balance and deduct stars
             payment_id = f"pay_{user_id}_{product_id}"
             self.logger.info(
-                f"Star payment processed: {amount_stars} stars for {product_name} "
-                f"from user {user_id}, payment: {payment_id}"
+                "Star payment processed: %s stars for %s "
+                "from user %s, payment: %s",
+                amount_stars, product_name, user_id, payment_id
             )
             
             return True, payment_id
             
         except Exception as e:
-            self.logger.exception(f"Error processing star payment: {e}")
+            self.logger.exception("Error processing star payment: %s", e)
             return False, None
     
     async def refund_stars(
@@ -257,23 +269,46 @@ class TelegramStarsAPI:
         """
         try:
             if amount <= 0:
-                self.logger.error(f"Invalid refund amount: {amount}")
+                self.logger.error("Invalid refund amount: %s", amount)
                 return False, None
             
             refund_id = f"refund_{user_id}_{transaction_id}"
             self.logger.info(
-                f"Stars refunded: {amount} to user {user_id}, "
-                f"original_transaction: {transaction_id}, "
-                f"reason: {reason}, refund: {refund_id}"
+                "Stars refunded: %s to user %s, "
+                "original_transaction: %s, "
+                "reason: %s, refund: %s",
+                amount, user_id, transaction_id, reason, refund_id
             )
             
             return True, refund_id
             
         except Exception as e:
-            self.logger.exception(f"Error processing refund: {e}")
+            self.logger.exception("Error processing refund: %s", e)
             return False, None
 
 
+class _TransactionRecords(Mapping[str, Dict]):
+    """Read-only transaction id -> record view over a StarsTransactionManager."""
+    
+    __slots__ = ("_manager",)
+    
+    def __init__(self, manager: "StarsTransactionManager"):
+        self._manager = manager
+    
+    def __getitem__(self, transaction_id: str) -> Dict:
+        manager = self._manager
+        return manager._record(manager._rows[transaction_id])
+    
+    def __contains__(self, transaction_id: object) -> bool:
+        return transaction_id in self._manager._rows
+    
+    def __iter__(self):
+        return iter(self._manager._rows)
+    
+    def __len__(self) -> int:
+        return len(self._manager._rows)
+
+
 class StarsTransactionManager:
     """
     Manages star transactions and maintains transaction history.
@@ -281,7 +316,40 @@ class StarsTransactionManager:
     
     def __init__(self):
         """Initialize transaction manager."""
-        self.transactions: Dict[str, Dict] = {}
+        # Transactions are stored column-wise, one row per transaction id;
+        # see transactions for the record view
+        self._rows: Dict[str, int] = {}
+        # Plain lists, so any user_id and amount the caller passes is
+        # stored as given, as with the original dict records
+        self._user_ids: List[int] = []
+        self._types: List[str] = []
+        self._amounts: List[int] = []
+        self._metadata: List[Dict] = []
+        self._timestamps: List[Optional[str]] = []
+        # user_id -> rows in recording order, so lookups skip other users
+        self._rows_by_user: Dict[int, List[int]] = defaultdict(list)
+        self._transactions_view = _TransactionRecords(self)
+    
+    @property
+    def transactions(self) -> Mapping[str, Dict]:
+        """
+        All transactions keyed by transaction id.
+        
+        A read-only view that builds each record when it is looked up, so
+        records are copies: editing one does not change the stored
+        transaction. Use record_transaction to add or replace one.
+        """
+        return self._transactions_view
+    
+    def _record(self, row: int) -> Dict:
+        """Build the transaction dict stored at a row."""
+        return {
+            "user_id": self._user_ids[row],
+            "type": self._types[row],
+            "amount": self._amounts[row],
+            "metadata": self._metadata[row],
+            "timestamp": self._timestamps[row]
+        }
     
     def record_transaction(
         self,
@@ -301,21 +369,37 @@ class StarsTransactionManager:
             amount: Amount in stars
             metadata: Additional transaction metadata
         """
-        self.transactions[transaction_id] = {
-            "user_id": user_id,
-            "type": transaction_type,
-            "amount": amount,
-            "metadata": metadata or {},
-            "timestamp": None  # Would be set to current UTC time
-        }
+        row = self._rows.get(transaction_id)
+        if row is not None:
+            # Re-recording an id replaces the transaction in place
+            previous_user_id = self._user_ids[row]
+            self._user_ids[row] = user_id
+            self._types[row] = transaction_type
+            self._amounts[row] = amount
+            self._metadata[row] = metadata or {}
+            self._timestamps[row] = None
+            if previous_user_id != user_id:
+                self._rows_by_user[previous_user_id].remove(row)
+                insort(self._rows_by_user[user_id], row)
+            return
+        
+        # Fill every column before indexing the row
+        row = len(self._types)
+        self._user_ids.append(user_id)
+        self._types.append(transaction_type)
+        self._amounts.append(amount)
+        self._metadata.append(metadata or {})
+        self._timestamps.append(None)  # Would be set to current UTC time
+        self._rows[transaction_id] = row
+        self._rows_by_user[user_id].append(row)
     
     def get_transaction(self, transaction_id: str) -> Optional[Dict]:
         """Get transaction details."""
-        return self.transactions.get(transaction_id)
+        row = self._rows.get(transaction_id)
+        if row is None:
+            return None
+        return self._record(row)
     
     def get_user_transactions(self, user_id: int) -> list:
         """Get all transactions for a user."""
-        return [
-            txn for txn in self.transactions.values()
-            if txn["user_id"] == user_id
-        ]
+        return [self._record(row) for row in self._rows_by_user.get(user_id, ())]
@@ -0,0 +1,133 @@
+"""Tests for utils.helpers."""
+
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from utils.helpers import (
+    get_time_ago, get_time_ago_batch, is_strong_password, is_valid_credit_card, is_valid_credit_cards_batch,
+    to_minor_units
+)
+
+# Same numbers written in Arabic-Indic digits, which take the non-ASCII path
+_ARABIC_INDIC = str.maketrans("0123456789", "".join(map(chr, range(0x0660, 0x066A))))
+
+
+class ToMinorUnitsTest(unittest.TestCase):
+    """The shared money converter rounds half up and reads floats as written."""
+
+    def test_rounds_half_up(self):
+        self.assertEqual(to_minor_units(12.345), 1235)
+        self.assertEqual(to_minor_units(Decimal("0.125")), 13)
+        self.assertEqual(to_minor_units(1.005), 101)
+
+    def test_ints_and_zero_decimal_currencies(self):
+        self.assertEqual(to_minor_units(15), 1500)
+        self.assertEqual(to_minor_units(1500, "JPY"), 1500)
+
+    def test_rejects_invalid_amounts(self):
+        with self.assertRaises(ValueError):
+            to_minor_units("abc")
+
+
+
+class CreditCardTest(unittest.TestCase):
+    """Luhn validation of ASCII card numbers, with separators stripped."""
+
+    def test_valid_numbers_of_each_parity(self):
+        for number in ("4222222222222", "378282246310005", "4532015112830366", "6011000000000000001"):
+            self.assertTrue(is_valid_credit_card(number), number)
+
+    def test_separators_are_stripped(self):
+        self.assertTrue(is_valid_credit_card("4532 0151 1283 0366"))
+        self.assertTrue(is_valid_credit_card("4532-0151-1283-0366"))
+        self.assertTrue(is_valid_credit_card("4532\t0151\u00a01283 0366"))
+
+    def test_rejected_input(self):
+        self.assertFalse(is_valid_credit_card("4532015112830367"))
+        self.assertFalse(is_valid_credit_card("000000000000"))
+        self.assertFalse(is_valid_credit_card("06011000000000000001"))
+        self.assertFalse(is_valid_credit_card("4532.0151.1283.0366"))
+        self.assertFalse(is_valid_credit_card("4532x15112830366"))
+        self.assertFalse(is_valid_credit_card(""))
+
+
+    def test_non_ascii_digits_of_each_parity(self):
+        for number in ("4222222222222", "378282246310005", "4532015112830366", "6011000000000000001"):
+            self.assertTrue(is_valid_credit_card(number.translate(_ARABIC_INDIC)), number)
+        self.assertFalse(is_valid_credit_card("4532015112830367".translate(_ARABIC_INDIC)))
+        self.assertFalse(is_valid_credit_card("378282246310006".translate(_ARABIC_INDIC)))
+
+    def test_batch_matches_single_validation(self):
+        numbers = ["4532015112830366", "4532-0151-1283-0366", "4532015112830367",
+                   "000000000000", "abc", "", "378282246310005".translate(_ARABIC_INDIC)]
+        self.assertEqual(is_valid_credit_cards_batch(numbers),
+                         [is_valid_credit_card(number) for number in numbers])
+        self.assertEqual(is_valid_credit_cards_batch([]), [])
+
+
+
+class StrongPasswordTest(unittest.TestCase):
+    """Strong passwords need 8+ characters and all four character classes."""
+
+    def test_accepts_all_four_classes(self):
+        self.assertTrue(is_strong_password("StrongPass123!"))
+        self.assertTrue(is_strong_password("aB3~aaaa"))
+
+    def test_rejects_missing_class_or_short(self):
+        self.assertFalse(is_strong_password("aB3!aaa"))
+        self.assertFalse(is_strong_password("WeakPass123"))
+        self.assertFalse(is_strong_password("weakpass123!"))
+        self.assertFalse(is_strong_password("WEAKPASS123!"))
+        self.assertFalse(is_strong_password("WeakPass!!!!"))
+        self.assertFalse(is_strong_password(""))
+
+    def test_non_ascii_characters(self):
+        # Any Unicode decimal digit counts; letters and symbols only in ASCII
+        self.assertTrue(is_strong_password("StrongPass\u0663!"))
+        self.assertFalse(is_strong_password("strongpass123!\u00c9"))
+        self.assertFalse(is_strong_password("StrongPass123\u00a7"))
+        self.assertFalse(is_strong_password("StrongPass\u00b2!"))
+        # Control characters are not a class, even the translate markers
+        self.assertFalse(is_strong_password("StrongPass123\x04"))
+
+
+
+class TimeAgoTest(unittest.TestCase):
+    """Each bucket starts just past the previous unit's boundary."""
+
+    def _ago(self, **delta):
+        return get_time_ago(datetime.now() - timedelta(**delta))
+
+    def test_bucket_boundaries(self):
+        self.assertEqual(self._ago(seconds=60), "just now")
+        self.assertEqual(self._ago(seconds=61), "1 minute ago")
+        self.assertEqual(self._ago(seconds=3600), "60 minutes ago")
+        self.assertEqual(self._ago(seconds=3601), "1 hour ago")
+        self.assertEqual(self._ago(hours=23, minutes=59), "23 hours ago")
+        self.assertEqual(self._ago(days=1), "1 day ago")
+        self.assertEqual(self._ago(days=30), "30 days ago")
+        self.assertEqual(self._ago(days=31), "1 month ago")
+        self.assertEqual(self._ago(days=365), "12 months ago")
+        self.assertEqual(self._ago(days=366), "1 year ago")
+        self.assertEqual(self._ago(days=800), "2 years ago")
+
+    def test_iso_strings(self):
+        self.assertEqual(get_time_ago((datetime.now() - timedelta(days=3)).isoformat()), "3 days ago")
+
+    def test_rejects_invalid_strings(self):
+        with self.assertRaises(ValueError):
+            get_time_ago("yesterday")
+        with self.assertRaises(ValueError):
+            get_time_ago_batch([datetime.now(), "yesterday"])
+
+    def test_batch_matches_single_calls(self):
+        now = datetime.now()
+        dates = [now - timedelta(hours=2), (now - timedelta(days=3)).isoformat(), now - timedelta(days=400), now]
+        self.assertEqual(get_time_ago_batch(dates), [get_time_ago(date) for date in dates])
+        self.assertEqual(get_time_ago_batch(dates), ["2 hours ago", "3 days ago", "1 year ago", "just now"])
+        self.assertEqual(get_time_ago_batch([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests for payments.offer_handler money calculations."""
+
+import json
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from payments import offer_handler
+from payments.offer_handler import OfferHandler, PaymentOffer
+
+
+class PaymentOfferTotalsTest(unittest.TestCase):
+    """Totals must accept the int and float amounts callers pass in practice."""
+
+    def test_int_amount(self):
+        offer = PaymentOffer("o1", "c1", 100, discount_percentage=10, discount_amount=5)
+        self.assertEqual(offer.calculate_total_cents(), 8500)
+        self.assertEqual(offer.calculate_total_amount(), Decimal("85.00"))
+        self.assertEqual(offer.to_dict()["total_amount"], 85.0)
+
+    def test_float_amount(self):
+        offer = PaymentOffer("o2", "c1", 19.99, discount_percentage=12.5, discount_amount=0.5)
+        # 19.99 - 2.49875 - 0.50 = 16.99125, rounded once to the cent
+        self.assertEqual(offer.calculate_total_cents(), 1699)
+        self.assertEqual(offer.calculate_total_amount(), Decimal("16.99"))
+
+    def test_rounds_half_up_once(self):
+        offer = PaymentOffer("o4", "c1", Decimal("10.05"), discount_percentage=Decimal("50"))
+        # 5.025 rounds half up to 5.03
+        self.assertEqual(offer.calculate_total_amount(), Decimal("5.03"))
+
+    def test_total_is_not_negative(self):
+        offer = PaymentOffer("o5", "c1", 10, discount_amount=25)
+        self.assertEqual(offer.calculate_total_cents(), 0)
+
+    def test_export_offer_with_int_amount(self):
+        handler = OfferHandler()
+        handler.create_offer("o3", "c1", 250)
+        exported = json.loads(handler.export_offer("o3"))
+        self.assertEqual(exported["total_amount"], 250.0)
+
+
+
+class ExportOfferTest(unittest.TestCase):
+    """export_offer output must not depend on which JSON encoder is installed."""
+
+    def test_stdlib_fallback_matches_json_dumps(self):
+        handler = OfferHandler()
+        offer = handler.create_offer("o1", "c1", Decimal("10"), description="Скидка")
+        with mock.patch.object(offer_handler, "orjson", None):
+            exported = handler.export_offer("o1")
+        self.assertEqual(exported, json.dumps(offer.to_dict(), indent=2))
+
+    def test_non_str_metadata_keys(self):
+        handler = OfferHandler()
+        handler.create_offer("o1", "c1", Decimal("10"), metadata={1: "one"})
+        self.assertEqual(json.loads(handler.export_offer("o1"))["metadata"], {"1": "one"})
+
+
+
+class UpdateOfferTest(unittest.TestCase):
+    """update_offer sets known fields and ignores the rest, as it always has."""
+
+    def test_unknown_keys_are_ignored(self):
+        handler = OfferHandler()
+        handler.create_offer("o1", "c1", Decimal("10"))
+        offer = handler.update_offer("o1", notes="vip", not_a_field=1, to_dict=None)
+        self.assertEqual(offer.notes, "vip")
+        self.assertEqual(offer.to_dict()["notes"], "vip")
+
+    def test_customer_change_moves_offer(self):
+        handler = OfferHandler()
+        handler.create_offer("o1", "c1", Decimal("10"))
+        handler.update_offer("o1", customer_id="c2")
+        self.assertEqual(handler.get_customer_offers("c1"), [])
+        self.assertEqual([o.offer_id for o in handler.get_customer_offers("c2")], ["o1"])
+
+
+
+class OfferHistoryTest(unittest.TestCase):
+    """get_offer_history returns baseline-shaped events and pages by seq."""
+
+    def test_records_use_plain_values(self):
+        handler = OfferHandler()
+        handler.create_offer("o1", "c1", Decimal("10"))
+        (event,) = handler.get_offer_history("o1")
+        self.assertIs(type(event["status"]), str)
+        self.assertEqual(event["status"], "draft")
+        self.assertEqual(event["event_type"], "created")
+        self.assertEqual(event["amount"], 10.0)
+
+    def test_since_seq_resumes_after_last_event(self):
+        handler = OfferHandler()
+        handler.create_offer("o1", "c1", Decimal("10"))
+        handler.create_offer("o2", "c1", Decimal("20"))
+        last_seq = handler.get_offer_history()[-1]["seq"]
+        handler.approve_offer("o1")
+        newer = handler.get_offer_history(since_seq=last_seq + 1)
+        self.assertEqual([(e["offer_id"], e["event_type"]) for e in newer], [("o1", "approved")])
+        self.assertEqual(handler.get_offer_history("o2", since_seq=last_seq + 1), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Tests for handlers.payment_handler offers and transactions."""
+
+import unittest
+from decimal import Decimal
+
+from handlers.payment_handler import (
+    Offer, OfferManager, OfferType, PaymentMethod, PaymentProcessor, PaymentStatus
+)
+
+
+def _discount_offer(**terms):
+    return Offer("d1", OfferType.DISCOUNT, "Discount", "Test discount", **terms)
+
+
+class OfferDiscountTest(unittest.TestCase):
+    """Discounts follow the offer's current terms, rounded half up to the cent."""
+
+    def test_fractional_basis_points_are_not_truncated(self):
+        offer = _discount_offer(discount_percentage=12.345)
+        self.assertEqual(offer.calculate_discount(Decimal("100")), Decimal("12.35"))
+
+    def test_reassigned_terms_are_used(self):
+        offer = _discount_offer(discount_percentage=10)
+        offer.min_amount = Decimal("200")
+        self.assertEqual(offer.calculate_discount(Decimal("100")), Decimal("0.00"))
+        offer.type = OfferType.CASHBACK
+        offer.cashback_amount = Decimal("5")
+        self.assertEqual(offer.calculate_discount(Decimal("300")), Decimal("5.00"))
+
+    def test_memoized_discount_follows_new_percentage(self):
+        offer = _discount_offer(discount_percentage=10, max_discount=Decimal("50"))
+        self.assertEqual(offer.calculate_discount(Decimal("5000")), Decimal("50.00"))
+        offer.max_discount = None
+        self.assertEqual(offer.calculate_discount(Decimal("5000")), Decimal("500.00"))
+        offer.discount_percentage = 15
+        self.assertEqual(offer.calculate_discount(Decimal("5000")), Decimal("750.00"))
+
+
+
+class OfferManagerAvailabilityTest(unittest.TestCase):
+    """get_available_offers reflects the offers dict and terms as they are now."""
+
+    def test_direct_dict_changes_are_seen(self):
+        manager = OfferManager()
+        del manager.offers["offer_001"]
+        manager.offers["d1"] = _discount_offer(discount_percentage=5)
+        ids = [offer.id for offer in manager.get_available_offers(Decimal("100"))]
+        self.assertEqual(ids, ["offer_002", "d1"])
+
+    def test_changed_min_amount_is_seen(self):
+        manager = OfferManager()
+        manager.offers["offer_003"].min_amount = Decimal("20")
+        ids = [offer.id for offer in manager.get_available_offers(Decimal("30"))]
+        self.assertEqual(ids, ["offer_001", "offer_003"])
+        manager.offers["offer_001"].min_amount = Decimal("40")
+        ids = [offer.id for offer in manager.get_available_offers(Decimal("30"))]
+        self.assertEqual(ids, ["offer_003"])
+
+
+
+class PaymentSummaryTest(unittest.TestCase):
+    """Summaries are plain serializable dicts, fresh for every caller."""
+
+    def setUp(self):
+        self.processor = PaymentProcessor()
+        self.transaction = self.processor.create_transaction(
+            "u1", Decimal("100"), payment_method=PaymentMethod.CARD
+        )
+
+    def test_enum_fields_are_plain_strings(self):
+        summary = self.processor.get_payment_summary(self.transaction.id)
+        self.assertIs(type(summary["status"]), str)
+        self.assertIs(type(summary["payment_method"]), str)
+        data = self.transaction.to_dict()
+        self.assertIs(type(data["status"]), str)
+        self.assertIs(type(data["payment_method"]), str)
+        offers = self.processor.display_offers(Decimal("100"))
+        self.assertTrue(all(type(offer["type"]) is str for offer in offers))
+
+    def test_callers_get_independent_copies(self):
+        first = self.processor.get_payment_summary(self.transaction.id)
+        self.assertTrue(first["applied_offers"])
+        first["status"] = "tampered"
+        first["applied_offers"][0]["discount"] = "999"
+        first["applied_offers"].append({"offer_id": "fake"})
+        second = self.processor.get_payment_summary(self.transaction.id)
+        self.assertEqual(second["status"], "pending")
+        self.assertNotIn({"offer_id": "fake"}, second["applied_offers"])
+        self.assertTrue(all(offer["discount"] != "999" for offer in second["applied_offers"]))
+
+    def test_summary_follows_status_updates(self):
+        self.assertEqual(self.processor.get_payment_summary(self.transaction.id)["status"], "pending")
+        self.processor.process_payment(self.transaction.id)
+        self.assertEqual(self.processor.get_payment_summary(self.transaction.id)["status"], "completed")
+
+
+
+class TransactionEvictionTest(unittest.TestCase):
+    """Past max_transactions, the least recently settled transactions go first."""
+
+    def setUp(self):
+        self.processor = PaymentProcessor(max_transactions=2)
+
+    def _create(self):
+        return self.processor.create_transaction("u1", Decimal("10"), payment_method=PaymentMethod.CARD).id
+
+    def _settled(self):
+        first, second = self._create(), self._create()
+        self.processor.process_payment(first)
+        self.processor.process_payment(second)
+        return first, second
+
+    def test_least_recently_settled_is_evicted(self):
+        first, second = self._settled()
+        third = self._create()
+        self.assertEqual(list(self.processor.transactions), [second, third])
+
+    def test_in_flight_transactions_are_kept(self):
+        ids = [self._create() for _ in range(4)]
+        self.assertEqual(list(self.processor.transactions), ids)
+        self.processor.process_payment(ids[2])
+        self._create()
+        self.assertNotIn(ids[2], self.processor.transactions)
+        self.assertEqual(len(self.processor.transactions), 4)
+
+    def test_refund_requeues_transaction(self):
+        first, second = self._settled()
+        self.processor.refund_transaction(first)
+        self._create()
+        self.assertIn(first, self.processor.transactions)
+        self.assertNotIn(second, self.processor.transactions)
+
+    def test_lookup_does_not_reorder(self):
+        first, second = self._settled()
+        self.processor.get_transaction(first)
+        self.processor.get_payment_summary(first)
+        self._create()
+        self.assertNotIn(first, self.processor.transactions)
+
+    def test_status_changed_outside_processor_is_not_evicted(self):
+        first, second = self._settled()
+        self.processor.transactions[first].status = PaymentStatus.PENDING
+        self._create()
+        self.assertIn(first, self.processor.transactions)
+        self.assertNotIn(second, self.processor.transactions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for handlers.payment_handlers offers and payment flows."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from handlers.payment_handlers import Offer, OfferButtonHandler, OfferType, PaymentFlowHandler
+
+
+def _offer(offer_id="o1", **terms):
+    return Offer(offer_id, OfferType.DISCOUNT, "Test offer", **terms)
+
+
+class OfferExpiryTest(unittest.TestCase):
+    """Expiry follows expiration_date as it is now, not as constructed."""
+
+    def test_reassigned_expiration_date_is_used(self):
+        offer = _offer(discount_percent=10, expiration_date=datetime.utcnow() + timedelta(days=1))
+        self.assertFalse(offer.is_expired())
+        offer.expiration_date = datetime.utcnow() - timedelta(days=1)
+        self.assertTrue(offer.is_expired())
+        self.assertEqual(offer.apply_to_amount(100), 100)
+        offer.expiration_date = None
+        self.assertFalse(offer.is_expired())
+        self.assertIsNone(offer.expiration_ts)
+
+
+
+class AvailableOffersTest(unittest.TestCase):
+    """get_available_offers reflects offers and their expiry as they are now."""
+
+    def test_expiry_and_direct_changes(self):
+        handler = OfferButtonHandler()
+        soon = _offer("soon", expiration_date=datetime.utcnow() + timedelta(hours=1))
+        handler.register_offer(soon)
+        handler.register_offer(_offer("forever"))
+        self.assertEqual([o.offer_id for o in handler.get_available_offers()], ["soon", "forever"])
+        soon.expiration_date = datetime.utcnow() - timedelta(seconds=1)
+        self.assertEqual([o.offer_id for o in handler.get_available_offers()], ["forever"])
+        handler.active_offers["direct"] = _offer("direct")
+        del handler.active_offers["forever"]
+        self.assertEqual([o.offer_id for o in handler.get_available_offers()], ["direct"])
+
+
+
+class PaymentSummaryTest(unittest.TestCase):
+    """Summaries follow the offer as it is now and are fresh for every caller."""
+
+    def setUp(self):
+        self.handler = PaymentFlowHandler()
+        self.offer = _offer(discount_percent=10, expiration_date=datetime.utcnow() + timedelta(days=1))
+        self.transaction = self.handler.create_transaction("t1", 100.0)
+        self.transaction.offer = self.offer
+
+    def test_expired_offer_changes_final_amount(self):
+        self.assertEqual(self.handler.get_payment_summary("t1")["final_amount"], 90.0)
+        self.offer.expiration_date = datetime.utcnow() - timedelta(seconds=1)
+        summary = self.handler.get_payment_summary("t1")
+        self.assertEqual(summary["final_amount"], 100.0)
+        self.assertEqual(summary["savings"], 0)
+
+    def test_in_place_offer_edit_changes_summary(self):
+        self.assertEqual(self.handler.get_payment_summary("t1")["final_amount"], 90.0)
+        self.offer.discount_percent = 25
+        self.assertEqual(self.handler.get_payment_summary("t1")["final_amount"], 75.0)
+
+    def test_callers_get_independent_copies(self):
+        first = self.handler.get_payment_summary("t1")
+        first["final_amount"] = 0
+        first["status"] = "tampered"
+        second = self.handler.get_payment_summary("t1")
+        self.assertEqual(second["final_amount"], 90.0)
+        self.assertEqual(second["status"], "pending")
+        self.assertIsNot(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
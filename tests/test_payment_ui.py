@@ -0,0 +1,50 @@
+"""Tests for utils.payment_ui payment option rendering."""
+
+import unittest
+
+from utils.payment_ui import PaymentOption, PaymentUIComponent
+
+
+class RenderOptionsTest(unittest.TestCase):
+    """Rendered options are fresh per call and follow payment_options."""
+
+    def setUp(self):
+        self.ui = PaymentUIComponent()
+        self.option = PaymentOption("basic", "Basic", 9.99)
+        self.ui.add_payment_option(self.option)
+
+    def test_default_features_are_not_shared(self):
+        first = self.ui.render_options()
+        first[0]["features"].append("HACK")
+        first[0]["name"] = "tampered"
+        second = self.ui.render_options()
+        self.assertEqual(second[0]["features"], [])
+        self.assertEqual(second[0]["name"], "Basic")
+
+    def test_direct_payment_options_changes_are_seen(self):
+        self.ui.render_options()
+        self.ui.payment_options["pro"] = PaymentOption("pro", "Pro", 19.99, features=["support"])
+        del self.ui.payment_options["basic"]
+        rendered = self.ui.render_options()
+        self.assertEqual([option["id"] for option in rendered], ["pro"])
+        self.assertEqual(rendered[0]["features"], ["support"])
+
+    def test_readding_refreshes_in_place_edits(self):
+        self.ui.render_options()
+        self.option.amount = 4.99
+        self.option.features = ["new"]
+        rendered = self.ui.render_options()
+        self.assertEqual(rendered[0]["amount"], 9.99)
+        self.assertEqual(rendered[0]["features"], ["new"])
+        self.ui.add_payment_option(self.option)
+        self.assertEqual(self.ui.render_options()[0]["amount"], 4.99)
+
+    def test_selection_is_rendered_per_call(self):
+        self.ui.select_option("basic")
+        self.assertTrue(self.ui.render_options()[0]["selected"])
+        self.ui.selected_option = None
+        self.assertFalse(self.ui.render_options()[0]["selected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
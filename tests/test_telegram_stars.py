@@ -0,0 +1,39 @@
+"""Tests for payments.telegram_stars transaction bookkeeping."""
+
+import unittest
+from decimal import Decimal
+
+from payments.telegram_stars import StarsTransactionManager
+
+
+class StarsTransactionManagerTest(unittest.TestCase):
+    """The column store must keep every row consistent with its indexes."""
+
+    def test_non_int_amounts_are_stored_as_given(self):
+        manager = StarsTransactionManager()
+        manager.record_transaction("a", 1, "purchase", 10.5)
+        manager.record_transaction("b", 2, "purchase", Decimal("5"))
+        self.assertEqual(manager.get_transaction("a")["amount"], 10.5)
+        self.assertEqual(manager.get_transaction("b")["amount"], Decimal("5"))
+        self.assertEqual(len(manager.transactions), 2)
+
+    def test_rerecording_moves_transaction_to_new_user(self):
+        manager = StarsTransactionManager()
+        manager.record_transaction("a", 1, "purchase", 10)
+        manager.record_transaction("b", 1, "purchase", 20)
+        manager.record_transaction("a", 2, "refund", 5)
+        self.assertEqual([t["amount"] for t in manager.get_user_transactions(1)], [20])
+        self.assertEqual(manager.get_user_transactions(2)[0]["type"], "refund")
+        self.assertEqual(list(manager.transactions), ["a", "b"])
+
+    def test_transactions_view_is_read_only(self):
+        manager = StarsTransactionManager()
+        manager.record_transaction("a", 1, "purchase", 10)
+        with self.assertRaises(TypeError):
+            manager.transactions["b"] = {}
+        self.assertIn("a", manager.transactions)
+        self.assertNotIn("b", manager.transactions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,18 +8,88 @@ This module provides reusable functions for common operations including:
 - Mathematical calculations
 """
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+from operator import attrgetter, itemgetter
 import re
-from typing import Union, Optional, List, Tuple
+from typing import Callable, Union, Optional, List, Tuple
 
 
 # ============================================================================
 # PRICE FORMATTING FUNCTIONS
 # ============================================================================
 
+_CURRENCY_SYMBOLS = {
+    'USD': '$',
+    'EUR': '€',
+    'GBP': '£',
+    'JPY': '¥',
+    'CHF': 'Fr',
+    'CAD': 'C$',
+    'AUD': 'A$',
+    'CNY': '¥',
+}
+
+# Below this magnitude a float that is a whole number of cents formats the same
+# with float rounding as via Decimal(str(x)) (cents stay well under 2**53)
+_FLOAT_CENTS_LIMIT = 1e13
+
+# Currencies whose minor unit is the major unit (no fractional part)
+_ZERO_DECIMAL_CURRENCIES = frozenset(('JPY',))
+
+# parse_price keeps only digits, '.' and '-'
+_PRICE_JUNK_RE = re.compile(r'[^\d.-]')
+# ASCII fast path: delete every other ASCII character in one C-level pass
+_PRICE_ASCII_JUNK = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if chr(c) not in '0123456789.-'
+))
+
+
+def _format_cents_2dp(cents: int) -> str:
+    """Format integer cents as a comma-grouped amount with two decimals."""
+    units, frac = divmod(abs(cents), 100)
+    sign = '-' if cents < 0 else ''
+    return f"{sign}{units:,}.{frac:02d}"
+
+
+def to_minor_units(amount: Union[float, int, Decimal, str], currency: str = "USD") -> int:
+    """
+    Convert an amount to integer minor units (cents, or yen for JPY).
+    
+    This is the one money-to-minor-units conversion used across the
+    project. Floats are read through str(), so 12.345 means the decimal
+    12.345 rather than its binary approximation, and half a minor unit
+    rounds away from zero (ROUND_HALF_UP).
+    
+    Args:
+        amount: The amount in major units
+        currency: Currency code - default: USD
+    
+    Returns:
+        Amount in the currency's smallest unit, rounded half up
+    
+    Example:
+        >>> to_minor_units(12.345)
+        1235
+        >>> to_minor_units(1500, 'JPY')
+        1500
+    """
+    zero_decimal = currency.upper() in _ZERO_DECIMAL_CURRENCIES
+    if type(amount) is int:
+        return amount if zero_decimal else amount * 100
+    try:
+        value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        if not zero_decimal:
+            value = value.scaleb(2)
+        return int(value.to_integral_value(rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid price amount: {amount}")
+
+
 def format_price(amount: Union[float, int, Decimal], currency: str = "USD", 
-                 decimal_places: int = 2) -> str:
+                 decimal_places: int = 2, use_cents: bool = False) -> str:
     """
     Format a price value with currency symbol and proper decimal places.
     
@@ -27,6 +97,7 @@ def format_price(amount: Union[float, int, Decimal], currency: str = "USD",
         amount: The price amount to format
         currency: Currency code (USD, EUR, GBP, etc.) - default: USD
         decimal_places: Number of decimal places - default: 2
+        use_cents: Treat an int amount as cents - default: False
     
     Returns:
         Formatted price string with currency symbol
@@ -36,22 +107,27 @@ def format_price(amount: Union[float, int, Decimal], currency: str = "USD",
         '$1,234.50'
         >>> format_price(1234.5, 'EUR', 2)
         '€1,234.50'
+        >>> format_price(123450, use_cents=True)
+        '$1,234.50'
     """
-    currency_symbols = {
-        'USD': '$',
-        'EUR': '€',
-        'GBP': '£',
-        'JPY': '¥',
-        'CHF': 'Fr',
-        'CAD': 'C$',
-        'AUD': 'A$',
-        'CNY': '¥',
-    }
-    
-    symbol = currency_symbols.get(currency.upper(), currency)
+    # Codes are usually passed uppercase already; only normalize on a miss
+    symbol = _CURRENCY_SYMBOLS.get(currency) or _CURRENCY_SYMBOLS.get(currency.upper(), currency)
+    
+    if type(amount) is int:
+        if decimal_places == 2:
+            # Pure integer formatting, no Decimal round trip
+            return f"{symbol}{_format_cents_2dp(amount if use_cents else amount * 100)}"
+        if use_cents:
+            amount = Decimal(amount).scaleb(-2)
+    elif (type(amount) is float and decimal_places == 2
+          and -_FLOAT_CENTS_LIMIT < amount < _FLOAT_CENTS_LIMIT
+          and (amount * 100).is_integer()):
+        # Nothing to round, so skip the float -> str -> Decimal round trip
+        return f"{symbol}{amount:,.2f}"
     
     try:
-        amount = Decimal(str(amount))
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
         formatted = f"{amount:,.{decimal_places}f}"
         return f"{symbol}{formatted}"
     except (InvalidOperation, ValueError):
@@ -75,7 +151,11 @@ def parse_price(price_string: str) -> float:
         100.0
     """
     # Remove currency symbols and commas
-    cleaned = re.sub(r'[^\d.-]', '', price_string)
+    if price_string.isascii():
+        cleaned = price_string.translate(_PRICE_ASCII_JUNK)
+    else:
+        # Non-ASCII symbols or Unicode digits need the regex
+        cleaned = _PRICE_JUNK_RE.sub('', price_string)
     try:
         return float(cleaned)
     except ValueError:
@@ -101,6 +181,16 @@ def calculate_discount(original_price: Union[float, int],
     if not 0 <= discount_percent <= 100:
         raise ValueError("Discount percent must be between 0 and 100")
     
+    if type(original_price) is int and type(discount_percent) is int:
+        # Exact in integers; int true division rounds the same as float(Decimal)
+        scaled_discount = original_price * discount_percent
+        return {
+            'original_price': float(original_price),
+            'discount_amount': scaled_discount / 100,
+            'discount_percent': discount_percent,
+            'final_price': (original_price * 100 - scaled_discount) / 100
+        }
+    
     discount_amount = Decimal(str(original_price)) * Decimal(str(discount_percent)) / 100
     final_price = Decimal(str(original_price)) - discount_amount
     
@@ -130,6 +220,16 @@ def calculate_tax(amount: Union[float, int], tax_rate: Union[float, int]) -> dic
     if tax_rate < 0:
         raise ValueError("Tax rate cannot be negative")
     
+    if type(amount) is int and type(tax_rate) is int:
+        # Exact in integers; int true division rounds the same as float(Decimal)
+        scaled_tax = amount * tax_rate
+        return {
+            'base_amount': float(amount),
+            'tax_amount': scaled_tax / 100,
+            'tax_rate': tax_rate,
+            'total': (amount * 100 + scaled_tax) / 100
+        }
+    
     amount_decimal = Decimal(str(amount))
     tax_amount = amount_decimal * Decimal(str(tax_rate)) / 100
     
@@ -141,10 +241,159 @@ def calculate_tax(amount: Union[float, int], tax_rate: Union[float, int]) -> dic
     }
 
 
+def calculate_discount_batch(original_prices: List[Union[float, int]], 
+                             discount_percent: Union[float, int]) -> dict:
+    """
+    Calculate discounts for many prices at the same discount percentage.
+    
+    Args:
+        original_prices: Original prices before discount
+        discount_percent: Discount percentage (0-100) applied to every price
+    
+    Returns:
+        Dictionary of parallel lists: original_price, discount_amount,
+        final_price, plus the shared discount_percent
+    
+    Example:
+        >>> calculate_discount_batch([100, 50], 20)
+        {'original_price': [100.0, 50.0], 'discount_amount': [20.0, 10.0], 'discount_percent': 20, 'final_price': [80.0, 40.0]}
+    """
+    if not 0 <= discount_percent <= 100:
+        raise ValueError("Discount percent must be between 0 and 100")
+    
+    if type(discount_percent) is int and all(type(price) is int for price in original_prices):
+        # All-integer batch: exact products, no Decimal per element
+        scaled = [price * discount_percent for price in original_prices]
+        return {
+            'original_price': [float(price) for price in original_prices],
+            'discount_amount': [discount / 100 for discount in scaled],
+            'discount_percent': discount_percent,
+            'final_price': [(price * 100 - discount) / 100
+                            for price, discount in zip(original_prices, scaled)]
+        }
+    
+    # Convert the shared rate once; dividing by 100 is exact in Decimal
+    rate = Decimal(str(discount_percent)) / 100
+    prices = [Decimal(str(price)) for price in original_prices]
+    discounts = [price * rate for price in prices]
+    
+    return {
+        'original_price': [float(price) for price in original_prices],
+        'discount_amount': [float(discount) for discount in discounts],
+        'discount_percent': discount_percent,
+        'final_price': [float(price - discount) for price, discount in zip(prices, discounts)]
+    }
+
+
+def calculate_tax_batch(amounts: List[Union[float, int]], tax_rate: Union[float, int]) -> dict:
+    """
+    Calculate tax on many amounts at the same tax rate.
+    
+    Args:
+        amounts: Base amounts
+        tax_rate: Tax rate as percentage (e.g., 10 for 10%) applied to every amount
+    
+    Returns:
+        Dictionary of parallel lists: base_amount, tax_amount, total, plus
+        the shared tax_rate
+    
+    Example:
+        >>> calculate_tax_batch([100, 50], 10)
+        {'base_amount': [100.0, 50.0], 'tax_amount': [10.0, 5.0], 'tax_rate': 10, 'total': [110.0, 55.0]}
+    """
+    if tax_rate < 0:
+        raise ValueError("Tax rate cannot be negative")
+    
+    if type(tax_rate) is int and all(type(amount) is int for amount in amounts):
+        # All-integer batch: exact products, no Decimal per element
+        scaled = [amount * tax_rate for amount in amounts]
+        return {
+            'base_amount': [float(amount) for amount in amounts],
+            'tax_amount': [tax / 100 for tax in scaled],
+            'tax_rate': tax_rate,
+            'total': [(amount * 100 + tax) / 100 for amount, tax in zip(amounts, scaled)]
+        }
+    
+    # Convert the shared rate once; dividing by 100 is exact in Decimal
+    rate = Decimal(str(tax_rate)) / 100
+    amounts_decimal = [Decimal(str(amount)) for amount in amounts]
+    taxes = [amount * rate for amount in amounts_decimal]
+    
+    return {
+        'base_amount': [float(amount) for amount in amounts],
+        'tax_amount': [float(tax) for tax in taxes],
+        'tax_rate': tax_rate,
+        'total': [float(amount + tax) for amount, tax in zip(amounts_decimal, taxes)]
+    }
+
+
 # ============================================================================
 # DATE/TIME FORMATTING FUNCTIONS
 # ============================================================================
 
+# strftime directives with a locale-independent %-format equivalent
+_STRFTIME_FIELDS = {
+    'Y': ('%d', 'year'),
+    'm': ('%02d', 'month'),
+    'd': ('%02d', 'day'),
+    'H': ('%02d', 'hour'),
+    'M': ('%02d', 'minute'),
+    'S': ('%02d', 'second'),
+}
+
+
+@lru_cache(maxsize=64)
+def _compile_strftime(fmt: str) -> Optional[Callable[[datetime], str]]:
+    """Translate a strftime format into a %-format over datetime fields, or None if unsupported."""
+    parts = []
+    attrs = []
+    chars = iter(fmt)
+    for char in chars:
+        if char == '%':
+            directive = next(chars, '')
+            if directive == '%':
+                parts.append('%%')
+                continue
+            field = _STRFTIME_FIELDS.get(directive)
+            if field is None:
+                return None
+            parts.append(field[0])
+            attrs.append(field[1])
+        else:
+            parts.append(char)
+    template = ''.join(parts)
+    if not attrs:
+        constant = template % ()
+        return lambda dt_obj: constant
+    render = template.__mod__
+    get_fields = attrgetter(*attrs)
+    return lambda dt_obj: render(get_fields(dt_obj))
+
+
+# The ISO-shaped formats format_date accepts; fromisoformat parses these identically
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2})?', re.ASCII)
+
+
+# get_time_ago buckets: lower bounds (inclusive) on whole days, and on the
+# seconds part once under a day, with the divisor and unit for each bucket
+_TIME_AGO_DAY_BOUNDS = (1, 31, 366)
+_TIME_AGO_DAY_UNITS = ((1, 'day'), (30, 'month'), (365, 'year'))
+_TIME_AGO_SECOND_BOUNDS = (61, 3601)
+_TIME_AGO_SECOND_UNITS = ((60, 'minute'), (3600, 'hour'))
+
+# Units accepted by calculate_time_difference, in the order the error lists them
+_TIME_DIFFERENCE_UNITS = ('days', 'hours', 'minutes', 'seconds')
+
+
+def _strftime(dt_obj: datetime, fmt: str) -> str:
+    """strftime that skips the C formatter for plain numeric formats."""
+    formatter = _compile_strftime(fmt)
+    # Padding of years below 1000 is platform-specific; leave those to strftime
+    if formatter is None or not isinstance(dt_obj, datetime) or dt_obj.year < 1000:
+        return dt_obj.strftime(fmt)
+    return formatter(dt_obj)
+
+
 def format_date(date_obj: Union[datetime, str], 
                 date_format: str = "%Y-%m-%d") -> str:
     """
@@ -161,6 +410,13 @@ def format_date(date_obj: Union[datetime, str],
         >>> format_date(datetime(2026, 1, 8), "%B %d, %Y")
         'January 08, 2026'
     """
+    if isinstance(date_obj, str) and _ISO_DATE_RE.fullmatch(date_obj):
+        # Skip the strptime attempts for the common ISO shapes
+        try:
+            date_obj = datetime.fromisoformat(date_obj)
+        except ValueError:
+            pass
+    
     if isinstance(date_obj, str):
         # Try to parse common formats
         for fmt in ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y"]:
@@ -172,7 +428,7 @@ def format_date(date_obj: Union[datetime, str],
         else:
             raise ValueError(f"Unable to parse date string: {date_obj}")
     
-    return date_obj.strftime(date_format)
+    return _strftime(date_obj, date_format)
 
 
 def format_datetime(dt_obj: Union[datetime, str], 
@@ -200,7 +456,7 @@ def format_datetime(dt_obj: Union[datetime, str],
             except ValueError:
                 raise ValueError(f"Unable to parse datetime string: {dt_obj}")
     
-    return dt_obj.strftime(dt_format)
+    return _strftime(dt_obj, dt_format)
 
 
 def calculate_time_difference(start_date: Union[datetime, str], 
@@ -230,17 +486,16 @@ def calculate_time_difference(start_date: Union[datetime, str],
     
     diff = end_date - start_date
     
-    unit_map = {
-        'days': lambda d: d.days,
-        'hours': lambda d: d.total_seconds() / 3600,
-        'minutes': lambda d: d.total_seconds() / 60,
-        'seconds': lambda d: d.total_seconds(),
-    }
-    
-    if unit not in unit_map:
-        raise ValueError(f"Invalid unit: {unit}. Must be one of {list(unit_map.keys())}")
+    if unit == 'days':
+        return diff.days
+    if unit == 'hours':
+        return diff.total_seconds() / 3600
+    if unit == 'minutes':
+        return diff.total_seconds() / 60
+    if unit == 'seconds':
+        return diff.total_seconds()
     
-    return unit_map[unit](diff)
+    raise ValueError(f"Invalid unit: {unit}. Must be one of {list(_TIME_DIFFERENCE_UNITS)}")
 
 
 def add_days(date_obj: Union[datetime, str], days: int) -> datetime:
@@ -281,28 +536,84 @@ def get_time_ago(date_obj: Union[datetime, str]) -> str:
     if isinstance(date_obj, str):
         date_obj = datetime.fromisoformat(date_obj)
     
-    diff = datetime.now() - date_obj
-    
-    if diff.days > 365:
-        return f"{diff.days // 365} year{'s' if diff.days // 365 > 1 else ''} ago"
-    elif diff.days > 30:
-        return f"{diff.days // 30} month{'s' if diff.days // 30 > 1 else ''} ago"
-    elif diff.days > 0:
-        return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
-    elif diff.seconds > 3600:
-        hours = diff.seconds // 3600
-        return f"{hours} hour{'s' if hours > 1 else ''} ago"
-    elif diff.seconds > 60:
-        minutes = diff.seconds // 60
-        return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+    return _format_time_ago(datetime.now() - date_obj)
+
+
+def get_time_ago_batch(date_objs: List[Union[datetime, str]]) -> List[str]:
+    """
+    Get "time ago" strings for many past dates against a single clock read.
+    
+    Args:
+        date_objs: Past datetime objects or strings
+    
+    Returns:
+        List of human-readable strings, one per date
+    
+    Example:
+        >>> now = datetime.now()
+        >>> get_time_ago_batch([now - timedelta(hours=2), now - timedelta(days=3)])
+        ['2 hours ago', '3 days ago']
+    """
+    now = datetime.now()
+    return [
+        _format_time_ago(now - (datetime.fromisoformat(date_obj) if isinstance(date_obj, str) else date_obj))
+        for date_obj in date_objs
+    ]
+
+
+def _format_time_ago(diff: timedelta) -> str:
+    """Render the delta between now and a past date as a "time ago" string."""
+    days = diff.days
+    bucket = bisect_right(_TIME_AGO_DAY_BOUNDS, days)
+    if bucket:
+        divisor, unit = _TIME_AGO_DAY_UNITS[bucket - 1]
+        count = days // divisor
     else:
-        return "just now"
+        # Less than a day: bucket on the seconds part instead
+        seconds = diff.seconds
+        bucket = bisect_right(_TIME_AGO_SECOND_BOUNDS, seconds)
+        if not bucket:
+            return "just now"
+        divisor, unit = _TIME_AGO_SECOND_UNITS[bucket - 1]
+        count = seconds // divisor
+    return f"{count} {unit}{'s' * (count > 1)} ago"
 
 
 # ============================================================================
 # VALIDATION FUNCTIONS
 # ============================================================================
 
+_MAX_EMAIL_LENGTH = 320
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Everything regex \s (and str.isspace) treats as whitespace
+_WHITESPACE = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    + ''.join(map(chr, range(0x2000, 0x200b)))
+    + '\u2028\u2029\u202f\u205f\u3000'
+)
+# Deletion tables for separators stripped before phone/card validation
+_PHONE_SEPARATORS = str.maketrans('', '', _WHITESPACE + '-().+')
+_PHONE_DIGITS_RE = re.compile(r'^\d{7,15}$')
+_URL_RE = re.compile(
+    r'^https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)$'
+)
+_CARD_SEPARATORS = str.maketrans('', '', _WHITESPACE + '-')
+# Luhn: value of each ASCII digit as-is and after doubling (digit sum folded)
+_LUHN_PLAIN = {str(d): d for d in range(10)}
+_LUHN_DOUBLED = {str(d): (2 * d if d < 5 else 2 * d - 9) for d in range(10)}
+# is_strong_password classifies ASCII with one translate pass: each class maps
+# to a marker control character and every other ASCII character is deleted
+# (including the markers themselves); non-ASCII characters pass through
+_CLASS_UPPER, _CLASS_LOWER, _CLASS_DIGIT, _CLASS_SPECIAL = '\x01', '\x02', '\x03', '\x04'
+_PASSWORD_CLASSES = dict.fromkeys(range(128))
+_PASSWORD_CLASSES.update(dict.fromkeys(map(ord, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'), _CLASS_UPPER))
+_PASSWORD_CLASSES.update(dict.fromkeys(map(ord, 'abcdefghijklmnopqrstuvwxyz'), _CLASS_LOWER))
+_PASSWORD_CLASSES.update(dict.fromkeys(map(ord, '0123456789'), _CLASS_DIGIT))
+_PASSWORD_CLASSES.update(dict.fromkeys(map(ord, '!@#$%^&*()_+-=[]{};:\'",.<>?/\\|`~'), _CLASS_SPECIAL))
+_ALL_PASSWORD_CLASSES = frozenset((_CLASS_UPPER, _CLASS_LOWER, _CLASS_DIGIT, _CLASS_SPECIAL))
+_NON_DIGIT_PASSWORD_CLASSES = frozenset((_CLASS_UPPER, _CLASS_LOWER, _CLASS_SPECIAL))
+
+
 def is_valid_email(email: str) -> bool:
     """
     Validate email address format.
@@ -319,8 +630,11 @@ def is_valid_email(email: str) -> bool:
         >>> is_valid_email('invalid.email')
         False
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    # Cheap rejections first: the pattern is ASCII-only and needs an '@';
+    # RFC 5321 caps a full address at 320 characters
+    if len(email) > _MAX_EMAIL_LENGTH or '@' not in email or not email.isascii():
+        return False
+    return bool(_EMAIL_RE.match(email))
 
 
 def is_valid_phone(phone: str) -> bool:
@@ -339,10 +653,13 @@ def is_valid_phone(phone: str) -> bool:
         >>> is_valid_phone('555-123-4567')
         True
     """
+    # Too short to hold 7 digits even before removing separators
+    if len(phone) < 7:
+        return False
     # Remove common separators and spaces
-    cleaned = re.sub(r'[\s\-\(\)\.+]', '', phone)
+    cleaned = phone.translate(_PHONE_SEPARATORS)
     # Check if it's mostly digits and has reasonable length
-    return bool(re.match(r'^\d{7,15}$', cleaned))
+    return bool(_PHONE_DIGITS_RE.match(cleaned))
 
 
 def is_valid_url(url: str) -> bool:
@@ -361,8 +678,7 @@ def is_valid_url(url: str) -> bool:
         >>> is_valid_url('not a url')
         False
     """
-    pattern = r'^https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)$'
-    return bool(re.match(pattern, url))
+    return bool(_URL_RE.match(url))
 
 
 def is_valid_credit_card(card_number: str) -> bool:
@@ -380,24 +696,62 @@ def is_valid_credit_card(card_number: str) -> bool:
         True
     """
     # Remove spaces and dashes
-    cleaned = re.sub(r'[\s\-]', '', card_number)
+    cleaned = card_number if card_number.isdigit() else card_number.translate(_CARD_SEPARATORS)
     
     if not cleaned.isdigit() or len(cleaned) < 13 or len(cleaned) > 19:
         return False
     
-    # Luhn algorithm
+    if cleaned.isascii():
+        # Every second digit from the right is doubled; walk each half by slicing
+        # and look the values up instead of branching per digit
+        total = (sum(map(_LUHN_PLAIN.__getitem__, cleaned[::-2]))
+                 + sum(map(_LUHN_DOUBLED.__getitem__, cleaned[-2::-2])))
+        return total % 10 == 0
+    
+    # Luhn algorithm for non-ASCII (e.g. Arabic-Indic) digits; odd positions
+    # from the right are doubled and folded without branching. Walking forward,
+    # the position from the right has the parity of i ^ last
+    last = len(cleaned) - 1
     total = 0
-    for i, digit in enumerate(reversed(cleaned)):
-        n = int(digit)
-        if i % 2 == 1:
-            n *= 2
-            if n > 9:
-                n -= 9
-        total += n
+    for i, digit in enumerate(cleaned):
+        n = int(digit) << ((i ^ last) & 1)
+        total += n - 9 * (n > 9)
     
     return total % 10 == 0
 
 
+def is_valid_credit_cards_batch(card_numbers: List[str]) -> List[bool]:
+    """
+    Validate many credit card numbers using the Luhn algorithm.
+    
+    Args:
+        card_numbers: Credit card numbers (spaces and dashes allowed)
+    
+    Returns:
+        List of booleans, one per card number, as is_valid_credit_card would return
+    
+    Example:
+        >>> is_valid_credit_cards_batch(['4532015112830366', '1234'])
+        [True, False]
+    """
+    # Bind the lookups once for the whole batch
+    separators = _CARD_SEPARATORS
+    plain = _LUHN_PLAIN.__getitem__
+    doubled = _LUHN_DOUBLED.__getitem__
+    
+    results = []
+    append = results.append
+    for card_number in card_numbers:
+        cleaned = card_number if card_number.isdigit() else card_number.translate(separators)
+        if not cleaned.isdigit() or not 13 <= len(cleaned) <= 19:
+            append(False)
+        elif cleaned.isascii():
+            append((sum(map(plain, cleaned[::-2])) + sum(map(doubled, cleaned[-2::-2]))) % 10 == 0)
+        else:
+            append(is_valid_credit_card(cleaned))
+    return results
+
+
 def is_strong_password(password: str) -> bool:
     """
     Validate password strength (min 8 chars, uppercase, lowercase, digit, special char).
@@ -417,12 +771,28 @@ def is_strong_password(password: str) -> bool:
     if len(password) < 8:
         return False
     
-    has_upper = bool(re.search(r'[A-Z]', password))
-    has_lower = bool(re.search(r'[a-z]', password))
-    has_digit = bool(re.search(r'\d', password))
-    has_special = bool(re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password))
-    
-    return has_upper and has_lower and has_digit and has_special
+    classes = set(password.translate(_PASSWORD_CLASSES))
+    if _ALL_PASSWORD_CLASSES <= classes:
+        return True
+    # Any Unicode decimal digit counts, as with the previous \d check
+    return (_NON_DIGIT_PASSWORD_CLASSES <= classes
+            and not password.isascii()
+            and any(c.isdecimal() for c in classes))
+
+
+def _is_numeric(value: str) -> bool:
+    """Check for digits with at most one '.' and one '-' anywhere."""
+    return value.replace('.', '', 1).replace('-', '', 1).isdigit()
+
+
+# validate_input field types: (validator, error message)
+_VALIDATORS = {
+    'email': (is_valid_email, "Invalid email format"),
+    'phone': (is_valid_phone, "Invalid phone format"),
+    'url': (is_valid_url, "Invalid URL format"),
+    'password': (is_strong_password, "Password does not meet strength requirements"),
+    'numeric': (_is_numeric, "Value must be numeric"),
+}
 
 
 def validate_input(value: str, field_type: str, 
@@ -455,18 +825,11 @@ def validate_input(value: str, field_type: str,
     if max_length and len(value) > max_length:
         return False, f"Value must be at most {max_length} characters"
     
-    validators = {
-        'email': (is_valid_email, "Invalid email format"),
-        'phone': (is_valid_phone, "Invalid phone format"),
-        'url': (is_valid_url, "Invalid URL format"),
-        'password': (is_strong_password, "Password does not meet strength requirements"),
-        'numeric': (lambda x: x.replace('.', '', 1).replace('-', '', 1).isdigit(), "Value must be numeric"),
-    }
-    
-    if field_type not in validators:
+    validator = _VALIDATORS.get(field_type)
+    if validator is None:
         return False, f"Unknown field type: {field_type}"
     
-    validator_func, error_msg = validators[field_type]
+    validator_func, error_msg = validator
     
     if not validator_func(value):
         return False, error_msg
@@ -478,6 +841,13 @@ def validate_input(value: str, field_type: str,
 # CALCULATION FUNCTIONS
 # ============================================================================
 
+# Ints below 2**53 convert to float exactly
+_INT_FLOAT_EXACT = 2 ** 53
+# Divisor bound under which an int ratio cannot sit close enough to a float
+# rounding boundary for the 28-digit Decimal path to round differently
+_INT_RATIO_LIMIT = 2 ** 30
+
+
 def round_decimal(value: Union[float, int, Decimal], 
                  decimal_places: int = 2) -> float:
     """
@@ -494,6 +864,10 @@ def round_decimal(value: Union[float, int, Decimal],
         >>> round_decimal(3.14159, 2)
         3.14
     """
+    if type(value) is int and -_INT_FLOAT_EXACT < value < _INT_FLOAT_EXACT and decimal_places >= 0:
+        # Nothing to round; the float conversion is exact
+        return float(value)
+    
     decimal_value = Decimal(str(value))
     return float(round(decimal_value, decimal_places))
 
@@ -519,6 +893,12 @@ def calculate_percentage(part: Union[float, int],
     if total == 0:
         raise ValueError("Total cannot be zero")
     
+    if (type(part) is int and type(total) is int
+            and -_INT_FLOAT_EXACT < part * 100 < _INT_FLOAT_EXACT
+            and -_INT_RATIO_LIMIT < total < _INT_RATIO_LIMIT):
+        # One correctly rounded int division gives the same float as the Decimal path
+        return part * 100 / total
+    
     return float(Decimal(str(part)) / Decimal(str(total)) * 100)
 
 
@@ -539,6 +919,12 @@ def calculate_average(values: List[Union[float, int]]) -> float:
     if not values:
         raise ValueError("List cannot be empty")
     
+    if all(type(v) is int for v in values):
+        int_total = sum(values)
+        if -_INT_FLOAT_EXACT < int_total < _INT_FLOAT_EXACT:
+            # One correctly rounded int division gives the same float as the Decimal path
+            return int_total / len(values)
+    
     return float(sum(Decimal(str(v)) for v in values) / len(values))
 
 
@@ -560,15 +946,27 @@ def calculate_total_with_items(items: List[dict], price_key: str = 'price',
         >>> calculate_total_with_items(items)
         40.0
     """
-    total = Decimal('0')
+    get_price_and_quantity = itemgetter(price_key, quantity_key)
     
-    for item in items:
-        if price_key not in item or quantity_key not in item:
-            raise KeyError(f"Item must contain '{price_key}' and '{quantity_key}' keys")
+    try:
+        # Integer prices and quantities sum exactly without Decimal
+        int_total = 0
+        for item in items:
+            price, quantity = get_price_and_quantity(item)
+            if type(price) is not int or type(quantity) is not int:
+                break
+            int_total += price * quantity
+        else:
+            if -_INT_FLOAT_EXACT < int_total < _INT_FLOAT_EXACT:
+                return float(int_total)
+        
+        total = Decimal('0')
         
-        price = Decimal(str(item[price_key]))
-        quantity = Decimal(str(item[quantity_key]))
-        total += price * quantity
+        for item in items:
+            price, quantity = get_price_and_quantity(item)
+            total += Decimal(str(price)) * Decimal(str(quantity))
+    except KeyError:
+        raise KeyError(f"Item must contain '{price_key}' and '{quantity_key}' keys") from None
     
     return float(total)
 
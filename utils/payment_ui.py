@@ -4,7 +4,7 @@ Provides reusable UI components for payment and offer functionality.
 """
 
 from dataclasses import dataclass
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Tuple
 from enum import Enum
 
 
@@ -51,6 +51,12 @@ class OfferButton:
         self.config = config
         self.on_click = on_click
         self._is_loading = False
+        # Enum .value strings for the current style/size; render refreshes
+        # them only if the config's style or size is swapped
+        self._style = config.style
+        self._size = config.size
+        self._style_value = config.style.value
+        self._size_value = config.size.value
     
     def render(self) -> Dict[str, Any]:
         """
@@ -59,14 +65,21 @@ class OfferButton:
         Returns:
             Dictionary containing button properties
         """
+        config = self.config
+        if config.style is not self._style or config.size is not self._size:
+            self._style = config.style
+            self._size = config.size
+            self._style_value = config.style.value
+            self._size_value = config.size.value
+        
         return {
             "type": "button",
-            "text": self.config.text,
-            "style": self.config.style.value,
-            "size": self.config.size.value,
-            "disabled": self.config.disabled or self._is_loading,
-            "icon": self.config.icon,
-            "tooltip": self.config.tooltip,
+            "text": config.text,
+            "style": self._style_value,
+            "size": self._size_value,
+            "disabled": config.disabled or self._is_loading,
+            "icon": config.icon,
+            "tooltip": config.tooltip,
             "loading": self._is_loading
         }
     
@@ -102,6 +115,9 @@ class PaymentUIComponent:
         self.payment_options: Dict[str, PaymentOption] = {}
         self.selected_option: Optional[str] = None
         self.is_processing = False
+        # option_id -> (option, rendered scalar fields); an entry
+        # is reused only while payment_options still holds that same object
+        self._rendered: Dict[str, Tuple[PaymentOption, Dict[str, Any]]] = {}
     
     def add_payment_option(self, option: PaymentOption) -> None:
         """
@@ -111,6 +127,8 @@ class PaymentUIComponent:
             option: Payment option configuration
         """
         self.payment_options[option.id] = option
+        # Re-adding the same object is how callers refresh an edited option
+        self._rendered.pop(option.id, None)
     
     def remove_payment_option(self, option_id: str) -> None:
         """
@@ -119,8 +137,8 @@ class PaymentUIComponent:
         Args:
             option_id: ID of option to remove
         """
-        if option_id in self.payment_options:
-            del self.payment_options[option_id]
+        if self.payment_options.pop(option_id, None) is not None:
+            self._rendered.pop(option_id, None)
     
     def select_option(self, option_id: str) -> bool:
         """
@@ -152,20 +170,46 @@ class PaymentUIComponent:
         """
         Render all payment options
         
+        Each option's scalar fields are read once and reused while
+        payment_options holds the same option object, so options added,
+        replaced or removed through payment_options directly are picked
+        up. In-place edits to id, name, amount, currency or description
+        are not; pass the option to add_payment_option again to re-render
+        it. features is read on every call. Every call returns a new list
+        of new dicts, and an option without features gets its own empty
+        list, so callers may modify the result.
+        
         Returns:
             List of rendered payment options
         """
+        selected_option = self.selected_option
+        payment_options = self.payment_options
+        cache = self._rendered
+        if len(cache) > len(payment_options):
+            # Forget options deleted from payment_options directly
+            cache = {option_id: cached for option_id, cached in cache.items()
+                     if option_id in payment_options}
+            self._rendered = cache
+        
         options = []
-        for option_id, option in self.payment_options.items():
-            options.append({
-                "id": option.id,
-                "name": option.name,
-                "amount": option.amount,
-                "currency": option.currency,
-                "description": option.description,
-                "features": option.features or [],
-                "selected": option_id == self.selected_option
-            })
+        for option_id, option in payment_options.items():
+            cached = cache.get(option_id)
+            if cached is not None and cached[0] is option:
+                entry = cached[1]
+            else:
+                entry = {
+                    "id": option.id,
+                    "name": option.name,
+                    "amount": option.amount,
+                    "currency": option.currency,
+                    "description": option.description,
+                }
+                cache[option_id] = (option, entry)
+            options.append(dict(
+                entry,
+                features=option.features or [],
+                selected=option_id == selected_option
+            ))
         return options
     
     def render(self) -> Dict[str, Any]: